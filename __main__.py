@@ -1,5 +1,12 @@
-import application
+import sys
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # Any arguments run the headless command line interface, which never
+        # imports tkinter
+        import cli
+        sys.exit(cli.main())
+
+    import application
     app = application.Application()
     app.mainloop()
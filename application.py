@@ -17,6 +17,7 @@ The mainloop method starts and runs the application.
 
 """
 
+import os
 import threading
 import tkinter as tk
 from tkinter import messagebox
@@ -29,6 +30,12 @@ import automator
 class Application:
     """The main application class for Auto-Conjuguemos.
 
+    Setting the AUTO_CONJUGUEMOS_KEEP_BROWSER environment variable keeps the
+    browser running after the window is closed, and the next launch reuses it.
+    The kept browser is quit with `python . --quit-browser`.
+    AUTO_CONJUGUEMOS_PREFETCH_WORKERS sets the most activity charts to
+    prefetch at the same time, `0` disables prefetching.
+
     Attributes:
         root: The tkinter GUI root.
         auto: The Automator instance that runs the webdriver.
@@ -37,12 +44,22 @@ class Application:
 
     def __init__(self):
         self.root = tk.Tk()
-        self.auto = automator.Automator()
+        self.auto = automator.Automator(
+            prefetch_workers=max(0, int(os.environ.get(
+                "AUTO_CONJUGUEMOS_PREFETCH_WORKERS", 4))),
+            persistent=bool(os.environ.get("AUTO_CONJUGUEMOS_KEEP_BROWSER")))
         self.scene = LoginScene(self.root, self.auto, self.change_scene)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
  
     def mainloop(self):
         self.root.mainloop()
 
+    def close(self):
+        """Closes the browser and the application window."""
+
+        self.auto.close()
+        self.root.destroy()
+
     def swap_scene(self, new_scene, args=(), kwargs=None):
         """Clears the current Scene and switches to a new Scene.
 
@@ -260,6 +277,9 @@ class ActivitySelectScene:
         for i, activity in enumerate(self.activity_list):
             self.listbox.insert(i, f"{i + 1}. {activity['name']}")
 
+        # Loads the activity charts while the user is choosing
+        self.auto.start_prefetch(self.activity_list)
+
         self.scrollbar = tk.Scrollbar(self.listbox)
         self.scrollbar.pack(side='right', fill='y')
         self.scrollbar.config(command=self.listbox.yview)
@@ -295,7 +315,7 @@ class ActivitySelectScene:
 
             activity['click']()  # clicks activity
 
-            self.auto.get_data(activity['name'])
+            self.auto.get_data(activity['name'], activity['url'])
 
             self.change_scene(self, True)
 
@@ -520,16 +540,20 @@ class AutomationScene:
 
     def __init__(self, root, auto, change_scene):
         self.root = root
-        self.root.geometry("450x450")
+        self.root.geometry("450x490")
         self.root.resizable(False, False)
         self.auto = auto
         self.change_scene = change_scene
 
         # Starts the automation loop in a separate thread
         def auto_func():
-            if not self.auto.activity_auto.run_automation(self.update):
+            completed = self.auto.activity_auto.run_automation(self.update)
+            if not completed:
                 AutomationScene.failed()
-            self.finished()
+            try:
+                self.auto.finish_run(completed)
+            finally:
+                self.finished()
 
         self.thread = threading.Thread(target=auto_func)
         self.thread.start()
@@ -577,9 +601,15 @@ class AutomationScene:
                      value_width,
                      data=str(self.auto.options["speed"]) + " s")
 
-        LabelDisplay(option_frame, 7, "Auto Submitting:",
+        self.achieved_speed_ld = LabelDisplay(
+            option_frame, 7, "Achieved Speed:", value_width, data="-")
+
+        LabelDisplay(option_frame, 8, "Auto Submitting:",
                      value_width, data="Yes"
                      if self.auto.options["auto_submit"] else "No")
+
+        self.browser_memory_ld = LabelDisplay(
+            option_frame, 9, "Browser Memory:", value_width, data="-")
         
         buttons = tk.Frame(self.root)
         buttons.pack(side='bottom', fill='x', padx=10, pady=10)
@@ -612,8 +642,27 @@ class AutomationScene:
         self.current_words_ld.update_data(f"{correct_words}/{current_words}")
         self.current_percent_ld.update_data(str(current_percent)+"%")
 
+        monitor = self.auto.monitor
+        if monitor is not None and monitor.samples:
+            self.browser_memory_ld.update_data(
+                f"{monitor.peaks['rss'] / 2**20:.0f} MB")
+
     def finished(self):
-        """Unlocks the Complete button after the automation is finished."""
+        """Unlocks the Complete button after the automation is finished.
+
+        Also displays the seconds per word that were actually achieved and
+        the browser's peak memory.
+        """
+
+        resources = self.auto.resource_report
+        if resources is not None:
+            self.browser_memory_ld.update_data(
+                f"{resources['peak_rss'] / 2**20:.0f} MB")
+
+        report = self.auto.activity_auto.pacing_report
+        if report is not None and report['achieved_speed'] is not None:
+            self.achieved_speed_ld.update_data(
+                f"{report['achieved_speed']:.2f} s")
 
         self.complete_button.config(state=tk.NORMAL)
 
@@ -5,13 +5,32 @@ instance in the Automator class specifically loads the data necessary to answer
 the activity questions and runs the loop that automates the activity.
 """
 
+import collections
+import multiprocessing
 import os
+import sqlite3
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 
-from selenium import webdriver
 from selenium.common.exceptions import (ElementClickInterceptedException,
                                         ElementNotInteractableException,
-                                        NoSuchElementException)
+                                        NoSuchElementException,
+                                        TimeoutException)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+import browser_session
+import chart_diff
+import chart_parser
+import corrections
+import lookup
+import pacing
+import prefetch
+import profiler
+import resource_monitor
+import run_history
 
 
 class Automator:
@@ -21,24 +40,121 @@ class Automator:
         driver: The webdriver used to control a browser.
         options: The options that control the conjuguemos activity.
         activity_auto: Automates the conjuguemos activity answers.
+        session: Starts, reuses and quits the browser.
+        correction_store: The answers the activities corrected, saved
+            between runs.
+        activities: The activity_auto of every loaded activity by name.
+        chart_store: The last loaded chart of every activity, saved
+            between runs.
+        monitor: Samples the browser's resources from get_data until the
+            run is finished.
+        resource_report: The browser's peak resources during the last run.
+        history: Keeps the summary of every finished run.
+        run_summary: The activity, start time, chart source and phase times
+            of the current run, recorded in the history by finish_run.
+        prefetch_workers: Most activity charts to prefetch at the same time,
+            `0` disables prefetching.
+        prefetcher: Prefetches the charts of the listed activities.
     """
 
-    def __init__(self):
-        self.driver = webdriver.Firefox(
-            executable_path=os.getcwd() + "\\res\\geckodriver.exe",
-            service_log_path=os.path.devnull)
-        self.driver.maximize_window()
+    # Longest time in seconds to wait for an element to become usable
+    WAIT_TIMEOUT = 10
+
+    # Seconds to wait for the chart on its first load before reloading it,
+    # since a chart that doesn't render at once usually needs a reload
+    CHART_FIRST_TIMEOUT = 1.5
+
+    def __init__(self, headless=False, preferences=None, prefetch_workers=4,
+                 persistent=False):
+        """Starts the browser on the conjuguemos login page.
+
+        Args:
+            headless: Runs the browser without a window if `True`, which
+                allows it to run on machines without a display.
+            preferences: Firefox preferences {name : value} for the browser.
+                Defaults to the lean preferences, which block images, web
+                fonts, media and third-party hosts. An empty dict loads the
+                site normally.
+            prefetch_workers: Most activity charts to prefetch at the same
+                time, `0` disables prefetching.
+            persistent: Keeps the browser running after the application
+                exits and reuses it on the next launch.
+        """
+
+        self.session = browser_session.BrowserSession(
+            headless=headless, preferences=preferences, persistent=persistent)
+        self.driver = self.session.start()
+        if self.session.attached:
+            # A reused browser may still be logged in from the last launch
+            self.driver.get("https://conjuguemos.com/auth/logout")
+        else:
+            self.driver.maximize_window()
         self.driver.get("https://conjuguemos.com/auth/login")
 
         self.activity_auto = None
         self.options = None
+        self.prefetch_workers = prefetch_workers
+        self.prefetcher = None
+        self.correction_store = corrections.CorrectionStore()
+        self.activities = {}
+        self.chart_store = chart_diff.ChartStore()
+        self.monitor = None
+        self.resource_report = None
+        self.history = run_history.RunHistory()
+        self.run_summary = None
 
         self.driver.find_element_by_id("identity").send_keys(
             "DO NOT LOGIN HERE! LOGIN IN THE AUTO-CONJUGUEMOS APP")
 
+    def close(self):
+        """Stops prefetching and closes the browser.
+
+        A persistent browser is left running for the next launch.
+        """
+
+        self.stop_prefetch()
+        self.stop_monitor()
+        self.session.close()
+
+    def wait_for(self, condition, timeout=None):
+        """Waits until an expected condition is met and returns its result.
+
+        Args:
+            condition: A selenium expected condition.
+            timeout: Seconds to wait, defaults to WAIT_TIMEOUT.
+
+        Raises:
+            TimeoutException: If the condition isn't met in time.
+        """
+
+        if timeout is None:
+            timeout = Automator.WAIT_TIMEOUT
+        return WebDriverWait(self.driver, timeout).until(condition)
+
+    def click_when_ready(self, locator):
+        """Clicks an element as soon as it accepts the click.
+
+        Retries while the element is missing, hidden or covered, for example
+        by a closing dialog.
+
+        Args:
+            locator: The (By, value) locator of the element.
+        """
+
+        def try_click(driver):
+            driver.find_element(*locator).click()
+            return True
+
+        WebDriverWait(self.driver, Automator.WAIT_TIMEOUT,
+                      ignored_exceptions=(NoSuchElementException,
+                                          ElementClickInterceptedException,
+                                          ElementNotInteractableException)
+                      ).until(try_click)
+
     def login_page(self):
         """Returns to the conjuguemos login page."""
 
+        self.stop_prefetch()
         self.driver.get("https://conjuguemos.com/auth/logout")
         self.driver.get("https://conjuguemos.com/auth/login")
 
@@ -85,47 +201,190 @@ class Automator:
 
         activity_list = []
         for a in activity_element_list:
-            activity_list.append({"name": a.text, "click": a.click})
+            activity_list.append({"name": a.text,
+                                  "url": a.get_attribute("href"),
+                                  "click": a.click})
 
         return activity_list
 
-    def get_data(self, name):
+    def start_prefetch(self, activity_list):
+        """Starts prefetching the charts of the activities in the background.
+
+        The charts are downloaded with the current session's cookies, so this
+        must be called after logging in.
+
+        Args:
+            activity_list: Activities as returned by get_activities.
+        """
+
+        if self.prefetch_workers <= 0:
+            return
+
+        if self.prefetcher is None:
+            self.prefetcher = prefetch.ChartPrefetcher(
+                self.driver.get_cookies(), self.driver.current_url,
+                user_agent=self.driver.execute_script(
+                    "return navigator.userAgent"),
+                max_workers=self.prefetch_workers)
+        self.prefetcher.prefetch([a["url"] for a in activity_list])
+
+    def stop_prefetch(self):
+        """Stops prefetching and forgets the prefetched charts."""
+
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+            self.prefetcher = None
+
+    @profiler.profiled("get_data")
+    def get_data(self, name, url=None):
         """Gets the vocab/conjugation data necessary to automate the activity.
 
-        If the activity is a vocab activity, it creates a VocabularyAuto 
-        instance as the activity_auto. If the activity is a conjugation 
-        activity, it creates a ConjugationAuto instance as the activity_auto.
-        It then loads the necessary data using the activity_auto's load_data
-        method.
+        If the activity is a vocab activity, it uses a VocabularyAuto
+        instance as the activity_auto. If the activity is a conjugation
+        activity, it uses a ConjugationAuto instance as the activity_auto.
+        It then uses the prefetched chart data if there is any, otherwise it
+        reads the data from the chart page using the activity_auto's
+        read_chart method.
+
+        An activity that was loaded before reuses its activity_auto, and
+        only the chart rows that changed since are applied to it.
 
         Args:
             name: The name of the activity.
+            url: The url of the activity as listed by get_activities, which
+                its chart was prefetched under.
         """
 
-        if "vocabulary" in self.driver.current_url:
-            insertion_pos = (self.driver.current_url.find("vocabulary")
-                + len("vocabulary"))
-            new_url = self.driver.current_url[:insertion_pos]
-            new_url += "/vocab_chart"+ self.driver.current_url[insertion_pos:]
-            self.driver.get(new_url)
-            self.activity_auto = VocabularyAuto(self.driver)
-        else:
-            insertion_pos = self.driver.current_url.find("verb") + len("verb")
-            new_url = self.driver.current_url[:insertion_pos]
-            new_url += "/verb_chart" + self.driver.current_url[insertion_pos:]
-            self.driver.get(new_url)
-            self.activity_auto = ConjugationAuto(self.driver)
+        self.start_monitor()
+        self.run_summary = {'activity': name, 'started_at': time.time()}
+        load_start = time.monotonic()
+
+        new_url, vocabulary = prefetch.chart_url(self.driver.current_url)
+        activity_class = VocabularyAuto if vocabulary else ConjugationAuto
+
+        self.activity_auto = self.activities.get(name)
+        if not isinstance(self.activity_auto, activity_class):
+            self.activity_auto = activity_class(self.driver)
+            self.activities[name] = self.activity_auto
 
         self.activity_auto.name = name
+        self.activity_auto.corrections = self.correction_store.table(name)
         self.options = self.activity_auto.options
 
-        self.driver.refresh()
-        self.activity_auto.load_data()
+        # Uses the prefetched chart if it is ready or almost ready
+        prefetched = None
+        if self.prefetcher is not None and url is not None:
+            prefetched = self.prefetcher.get(
+                url, timeout=Automator.WAIT_TIMEOUT)
+        if prefetched is not None and prefetched['vocabulary'] == vocabulary:
+            self.update_chart(name, prefetched['data'])
+            self.run_summary['chart_source'] = 'prefetch'
+            self.run_summary['chart_load_seconds'] = (
+                time.monotonic() - load_start)
+            return
+
+        self.driver.get(new_url)
+
+        # Only reloads the chart if it doesn't appear on the first load
+        chart = expected_conditions.presence_of_element_located(
+            self.activity_auto.CHART_LOCATOR)
+        try:
+            self.wait_for(chart, timeout=Automator.CHART_FIRST_TIMEOUT)
+        except TimeoutException:
+            self.driver.refresh()
+            self.wait_for(chart)
+
+        self.update_chart(name, self.activity_auto.read_chart())
         self.driver.back()
+        self.run_summary['chart_source'] = 'page'
+        self.run_summary['chart_load_seconds'] = time.monotonic() - load_start
+
+    def update_chart(self, name, data):
+        """Applies a loaded chart to the activity_auto and the stored chart.
+
+        Args:
+            name: The name of the activity.
+            data: The chart data, as from the activity_auto's read_chart.
+        """
+
+        rows, delta = self.activity_auto.update_data(
+            data, previous_rows=self.chart_store.rows(name))
+        if self.chart_store.patch(name, rows, delta):
+            self.chart_store.save()
 
+    def save_corrections(self):
+        """Saves the answers the activities corrected for the next run."""
+
+        self.correction_store.save()
+
+    def start_monitor(self):
+        """Starts sampling the browser and geckodriver processes."""
+
+        self.stop_monitor()
+        self.monitor = resource_monitor.ResourceMonitor(self.session.pids())
+        self.monitor.start()
+
+    def stop_monitor(self):
+        """Stops sampling the browser and saves the resource report."""
+
+        if self.monitor is not None:
+            self.monitor.stop()
+            self.resource_report = self.monitor.report()
+            self.monitor = None
+
+    def finish_run(self, completed=True):
+        """Saves the corrections, stops the monitor and records the run.
+
+        Must be called after the activity_auto's run_automation finishes.
+
+        Args:
+            completed: What run_automation returned.
+        """
+
+        # A failed write only loses the saved data, not the finished run
+        try:
+            self.save_corrections()
+        except OSError as e:
+            sys.stderr.write(f"Couldn't save the corrections: {e}\n")
+        self.stop_monitor()
+        try:
+            self.record_run(completed)
+        except (OSError, sqlite3.Error) as e:
+            sys.stderr.write(f"Couldn't record the run: {e}\n")
+
+    def record_run(self, completed):
+        """Records the summary and answer latencies of the run."""
+
+        if self.run_summary is None:
+            return
+
+        run = dict(self.run_summary, completed=completed)
+        self.run_summary = None
+
+        report = self.activity_auto.pacing_report
+        if report is not None:
+            run['configured_speed'] = report['configured_speed']
+            run['achieved_speed'] = report['achieved_speed']
+
+        latencies = ()
+        stats = self.activity_auto.run_stats
+        if stats is not None:
+            latencies = stats['latencies']
+            run['automation_seconds'] = stats['seconds']
+            for key in ('answers', 'correct_answers', 'checked_answers',
+                        'mistakes', 'failures'):
+                run[key] = stats[key]
+
+        if self.resource_report is not None:
+            run['peak_rss'] = self.resource_report['peak_rss']
+
+        self.history.record(run, latencies)
+
+    @profiler.profiled("prepare_start")
     def prepare_start(self):
         """Sets up and starts the conjugation activity."""
 
+        start = time.monotonic()
         insertion_end = self.driver.current_url.rfind("/")
         insertion_pos = self.driver.current_url.rfind("/", insertion_end) + 1
 
@@ -133,14 +392,18 @@ class Automator:
             self.driver.current_url[:insertion_pos] + "/homework" +
             self.driver.current_url[insertion_end:])
 
-        self.driver.find_element_by_class_name("slider-time").click()
-        set_time = self.driver.find_element_by_id("set_time_input")
+        self.click_when_ready((By.CLASS_NAME, "slider-time"))
+        set_time = self.wait_for(
+            expected_conditions.visibility_of_element_located(
+                (By.ID, "set_time_input")))
         set_time.clear()
         set_time.send_keys(self.activity_auto.options["time_limit"])
-        self.driver.find_element_by_xpath(
-            "//*[contains(text(), 'Save Settings')]").click()
-        time.sleep(0.5)
-        self.driver.find_element_by_id("start-button").click()
+        self.click_when_ready(
+            (By.XPATH, "//*[contains(text(), 'Save Settings')]"))
+        self.click_when_ready((By.ID, "start-button"))
+
+        if self.run_summary is not None:
+            self.run_summary['start_seconds'] = time.monotonic() - start
 
 
 class ActivityAuto:
@@ -154,11 +417,88 @@ class ActivityAuto:
         driver: The webdriver used to interact with the browser.
         name: The name of the activity.
         options: The options to be used in the activity automation
+        pacing_report: The configured and achieved speed of the last run.
+        corrections: The activity's corrected answers {prompt : answer},
+            which are used before the chart data.
+        last_prompt: The prompt of the last question that was answered.
+        fingerprints: Fingerprints of the saved chart rows, `None` if the
+            data wasn't saved through update_data.
+        run_stats: The answers, feedback, retried interactions and answer
+            latencies of the last run.
     """
 
+    # Longest time in seconds between GUI updates while waiting to answer
+    UPDATE_INTERVAL = 0.05
+
+    # (By, value) locator of an element that shows the chart page has loaded,
+    # must be set by child class
+    CHART_LOCATOR = None
+
+    # CSS selectors of the elements whose texts make up the question's
+    # prompt, must be set by child class
+    PROMPT_SELECTORS = ()
+
+    # CSS selectors of the activity's answer feedback, the feedback when the
+    # answer was wrong, and the expected answer shown inside the feedback.
+    # They haven't been checked against the live activity page, so each can
+    # be replaced with an environment variable without changing the code.
+    FEEDBACK_SELECTOR = os.environ.get(
+        "AUTO_CONJUGUEMOS_FEEDBACK_SELECTOR", "#feedback")
+    INCORRECT_SELECTOR = os.environ.get(
+        "AUTO_CONJUGUEMOS_INCORRECT_SELECTOR", ".incorrect")
+    EXPECTED_SELECTOR = os.environ.get(
+        "AUTO_CONJUGUEMOS_EXPECTED_SELECTOR", ".correct-answer")
+
+    # Records each feedback in the page along with the prompt it was shown
+    # for, so it can be read in batches while waiting to answer instead of
+    # after every answer. A mutation that doesn't change the feedback text
+    # or the prompt, like a fade out, isn't recorded again. Returns `false`
+    # if the activity has no feedback element.
+    FEEDBACK_OBSERVER_SCRIPT = """
+        var feedback = document.querySelector(arguments[0]);
+        if (!feedback) { return false; }
+        if (window.autoConjuguemosFeedback) { return true; }
+        window.autoConjuguemosFeedback = [];
+        var incorrect = arguments[1], expected = arguments[2];
+        var promptSelectors = arguments[3], last = null;
+        new MutationObserver(function () {
+            var text = feedback.textContent.trim();
+            if (!text) { return; }
+            var prompt = promptSelectors.map(function (selector) {
+                var element = document.querySelector(selector);
+                return element ? element.innerText.trim() : "";
+            });
+            var key = JSON.stringify([text, prompt]);
+            if (key === last) { return; }
+            last = key;
+            var expectedElement = feedback.querySelector(expected);
+            window.autoConjuguemosFeedback.push({
+                prompt: prompt,
+                correct: !(feedback.matches(incorrect)
+                           || feedback.querySelector(incorrect)),
+                expected: expectedElement
+                    ? expectedElement.textContent.trim() : null});
+        }).observe(feedback, {childList: true, subtree: true,
+                              characterData: true, attributes: true});
+        return true;
+    """
+
+    FEEDBACK_DRAIN_SCRIPT = """
+        return window.autoConjuguemosFeedback
+            ? window.autoConjuguemosFeedback.splice(0) : [];
+    """
+
+    # Whether the missing feedback element was already warned about
+    _feedback_warned = False
+
     def __init__(self, driver):
         self.driver = driver
         self.name = ""
+        self.pacing_report = None
+        self.corrections = None
+        self.last_prompt = None
+        self.fingerprints = None
+        self.run_stats = None
         self.options = {'time_limit': None,
                         'word_amount': None,
                         'target_percent': None,
@@ -183,6 +523,162 @@ class ActivityAuto:
         """
         raise NotImplementedError
 
+    def get_prompt(self, **kwargs):
+        """Must be overridden by child class.
+
+        This method will return the prompt of the current question, in the
+        form corrections are stored with, from the activity's elements.
+        """
+        raise NotImplementedError
+
+    def feedback_prompt(self, texts):
+        """Must be overridden by child class.
+
+        This method will return the prompt a feedback was shown for, in the
+        same form as get_prompt, from the texts of the PROMPT_SELECTORS
+        elements.
+        """
+        raise NotImplementedError
+
+    def set_data(self, data):
+        """Must be overridden by child class.
+
+        This method will save chart data that was parsed somewhere else, in
+        the same form load_data builds it.
+        """
+        raise NotImplementedError
+
+    def read_chart(self):
+        """Must be overridden by child class.
+
+        This method will parse and return the data of the chart page that is
+        currently open, without saving it.
+        """
+        raise NotImplementedError
+
+    def chart_rows(self, data):
+        """Must be overridden by child class.
+
+        This method will return the chart data as rows {row key : row}, the
+        form the chart is fingerprinted and diffed in.
+        """
+        raise NotImplementedError
+
+    def apply_delta(self, rows, delta):
+        """Must be overridden by child class.
+
+        This method will update the saved data with only the inserted,
+        removed and changed rows of a reloaded chart.
+        """
+        raise NotImplementedError
+
+    def update_data(self, data, previous_rows=None):
+        """Saves chart data, applying only the rows changed since last time.
+
+        The first time, or after set_data, all the data is saved with
+        set_data. After that, the rows are fingerprinted and only the rows
+        whose fingerprints changed are applied.
+
+        Args:
+            data: The chart data, as from read_chart.
+            previous_rows: The rows {row key : row} of the chart's last load
+                before this activity_auto existed, as from a ChartStore.
+                The first delta is found against them, so it includes the
+                rows that were removed since.
+
+        Returns:
+            tuple: (the chart rows {row key : row}, the delta as from
+            chart_diff.diff).
+        """
+
+        rows = self.chart_rows(data)
+        fingerprints = chart_diff.fingerprints(rows)
+        if self.fingerprints is None:
+            self.set_data(data)
+            delta = chart_diff.diff(
+                chart_diff.fingerprints(previous_rows or {}), fingerprints)
+        else:
+            delta = chart_diff.diff(self.fingerprints, fingerprints)
+            if not chart_diff.is_empty(delta):
+                self.apply_delta(rows, delta)
+        self.fingerprints = fingerprints
+        return rows, delta
+
+    def corrected(self, prompt):
+        """Returns the activity's corrected answer to a prompt, or `None`."""
+
+        if self.corrections is None:
+            return None
+        return self.corrections.get(prompt)
+
+    def watch_feedback(self):
+        """Starts recording the activity's answer feedback in the page.
+
+        Warns once if the feedback element isn't found, since the answers
+        can't be checked or corrected then.
+
+        Returns:
+            `True` if the activity has feedback to record.
+        """
+
+        watching = bool(self.driver.execute_script(
+            ActivityAuto.FEEDBACK_OBSERVER_SCRIPT,
+            ActivityAuto.FEEDBACK_SELECTOR,
+            ActivityAuto.INCORRECT_SELECTOR,
+            ActivityAuto.EXPECTED_SELECTOR,
+            list(self.PROMPT_SELECTORS)))
+
+        if not watching and not ActivityAuto._feedback_warned:
+            ActivityAuto._feedback_warned = True
+            sys.stderr.write(
+                f"No answer feedback found at "
+                f"'{ActivityAuto.FEEDBACK_SELECTOR}', wrong answers won't "
+                f"be corrected or counted. Set "
+                f"AUTO_CONJUGUEMOS_FEEDBACK_SELECTOR to the activity's "
+                f"feedback element.\n")
+        return watching
+
+    def apply_feedback(self, attempts):
+        """Reads the recorded feedback and learns from the wrong answers.
+
+        Each feedback is matched to the oldest waiting answer with the same
+        prompt. The answers before it never got feedback and are dropped,
+        and feedback that matches no answer is ignored, so a missing or
+        repeated feedback can't be blamed on the wrong prompt.
+
+        Args:
+            attempts: Deque of the answers still waiting for feedback, in
+                order. Each is (prompt, answer), where the answer is `None`
+                if it was wrong on purpose.
+        """
+
+        for feedback in self.driver.execute_script(
+                ActivityAuto.FEEDBACK_DRAIN_SCRIPT):
+            prompt = self.feedback_prompt(feedback['prompt'])
+            position = next((i for i, (p, _) in enumerate(attempts)
+                             if p == prompt), None)
+            if position is None:
+                continue
+            for _ in range(position):
+                attempts.popleft()
+
+            prompt, answer = attempts.popleft()
+            if answer is None:
+                continue
+
+            if self.run_stats is not None:
+                self.run_stats['checked_answers'] += 1
+                if not feedback['correct']:
+                    self.run_stats['mistakes'] += 1
+            if feedback['correct'] or self.corrections is None:
+                continue
+
+            if feedback['expected'] and feedback['expected'] != answer:
+                self.corrections.add(prompt, feedback['expected'])
+            else:
+                # A stored correction that is still wrong is forgotten
+                self.corrections.remove(prompt)
+
     def try_submit(self):
         """Tries to submit the activity, returns result.
 
@@ -209,6 +705,7 @@ class ActivityAuto:
         except NoSuchElementException:
             return False
 
+    @profiler.profiled("run_automation")
     def run_automation(self, update_data):
         """The main loop that automates the conjuguemos activity.
 
@@ -225,34 +722,46 @@ class ActivityAuto:
 
         question_index = 0
 
-        last_action_time = 0.0
+        self.pacing_report = None
+        self.run_stats = {'answers': 0,
+                          'correct_answers': 0,
+                          'checked_answers': 0,
+                          'mistakes': 0,
+                          'failures': 0,
+                          'latencies': [],
+                          'seconds': None}
 
         try:
             elements = self.get_elements()
         except NoSuchElementException:
             return False
 
-        start_time = time.time()
+        # Answers waiting for the activity's feedback, and how long reading
+        # the feedback last took
+        attempts = collections.deque() if self.watch_feedback() else None
+        feedback_time = 0.0
+
+        pacer = pacing.Pacer(self.options["speed"])
+        pacer.start()
 
         correct_questions = 0
 
         answering_wrong = False
 
         while True:
-            current_time = time.time()
-            elapsed_time = current_time - last_action_time
             try:
-                if (question_index < self.options["word_amount"] and
-                    elapsed_time >= self.options["speed"]):
-
-                    last_action_time = time.time()
+                answering = question_index < self.options["word_amount"]
+                if answering and pacer.due():
 
                     # Checks if percent would be lower than target
                     # if answer is wrong.
                     answering_wrong = (correct_questions / (question_index + 1)
                         > self.options["target_percent"]/100.0)
+                    answer_start = time.monotonic()
                     if answering_wrong:
                         ans = f"wrong {question_index + 1}"
+                        if attempts is not None:
+                            self.last_prompt = self.get_prompt(**elements)
                     else:
                         ans = self.get_answer(**elements)
 
@@ -260,12 +769,20 @@ class ActivityAuto:
                     elements['answer_element'].send_keys(ans)
                     elements['button_element'].click()
 
+                    pacer.mark_done()
+                    self.run_stats['latencies'].append(
+                        time.monotonic() - answer_start)
+
+                    if attempts is not None:
+                        attempts.append((self.last_prompt,
+                                         None if answering_wrong else ans))
+
                     question_index += 1
                     if not answering_wrong:
                         correct_questions += 1
 
                 time_left = (60 * self.options["time_limit"]
-                             - int(current_time - start_time))
+                             - int(pacer.elapsed()))
 
                 if time_left < 0:
                     break
@@ -276,13 +793,34 @@ class ActivityAuto:
                             question_index,
                             correct_questions,
                             int(100 * correct_questions / question_index))
-                
-                time.sleep(0.05)
+
+                # Reads the feedback only if it won't delay the next answer
+                if attempts and (not answering
+                                 or pacer.remaining() > feedback_time):
+                    feedback_start = time.monotonic()
+                    self.apply_feedback(attempts)
+                    feedback_time = time.monotonic() - feedback_start
+
+                # Sleeps until the next answer is due, but wakes up often
+                # enough to keep the GUI clock updating
+                if answering:
+                    pacer.wait(ActivityAuto.UPDATE_INTERVAL)
+                else:
+                    time.sleep(ActivityAuto.UPDATE_INTERVAL)
 
             except (ElementClickInterceptedException,
                     ElementNotInteractableException):
+                self.run_stats['failures'] += 1
                 continue
 
+        self.pacing_report = pacer.report()
+        self.run_stats['answers'] = question_index
+        self.run_stats['correct_answers'] = correct_questions
+        self.run_stats['seconds'] = pacer.elapsed()
+
+        if attempts:
+            self.apply_feedback(attempts)
+
         if self.options["auto_submit"]:
             while not self.check_finished():
                 pass 
@@ -297,12 +835,18 @@ class VocabularyAuto(ActivityAuto):
     
     Attributes:
         vocab_dict: Dictionary of vocab words {english : spanish}.
+        index: Finds answers to prompts that don't exactly match the chart.
         question_element: The web element of the question.
     """
 
+    CHART_LOCATOR = (By.XPATH, "//table[@class='table table--fat']")
+
+    PROMPT_SELECTORS = ("#question-input",)
+
     def __init__(self, driver):
         ActivityAuto.__init__(self, driver)
         self.vocab_dict = {}
+        self.index = lookup.AnswerIndex(self.vocab_dict)
         self.question_element = None
 
     def get_elements(self):
@@ -319,10 +863,23 @@ class VocabularyAuto(ActivityAuto):
         
         return elements
     
+    def get_prompt(self, **kwargs):
+        """Returns the question's text."""
+
+        return self.feedback_prompt((kwargs['question_element'].text,))
+
+    def feedback_prompt(self, texts):
+        """Returns the question's text with its whitespace collapsed."""
+
+        return " ".join(texts[0].split())
+
     def get_answer(self, **kwargs):
         """Gets the correct answer based on the activity question."""
 
-        answer = self.vocab_dict[kwargs['question_element'].text]
+        self.last_prompt = self.get_prompt(**kwargs)
+        answer = self.corrected(self.last_prompt)
+        if answer is None:
+            answer = self.index.lookup(self.last_prompt)
 
         # Only uses the first of multiple slash separated answers
         slash_index = answer.find("/")
@@ -338,20 +895,41 @@ class VocabularyAuto(ActivityAuto):
         current activity.
         """
 
+        self.set_data(self.read_chart())
+
+    def read_chart(self):
+        """Parses and returns the vocab dictionary of the vocabulary chart."""
+
         table = self.driver.find_element_by_xpath(
             "//table[@class='table table--fat']")
         cells = table.find_elements_by_xpath(".//td")
-        english = []
-        spanish = []
-        self.vocab_dict = {}
-        for i, cell in enumerate(cells):
-            text = cell.text
-            if i % 2 == 0:
-                english.append(text[text.find(".") + 1:])
-            else:
-                spanish.append(text[text.find(".") + 1:])
-        for e, s in zip(english, spanish):
-            self.vocab_dict[e.strip()] = s.strip()
+        return chart_parser.vocab_from_cells([cell.text for cell in cells])
+
+    def set_data(self, data):
+        """Saves a vocab dictionary {english : spanish} and indexes it."""
+
+        self.vocab_dict = dict(data)
+        self.index = lookup.AnswerIndex(self.vocab_dict)
+        self.fingerprints = None
+
+    def chart_rows(self, data):
+        """Returns the vocab dictionary's rows, keyed by english word."""
+
+        return data
+
+    def apply_delta(self, rows, delta):
+        """Updates the vocab dictionary and its index with changed rows.
+
+        The index takes the reloaded chart's order first, so prompts that
+        more than one row answers resolve as if the index was rebuilt.
+        """
+
+        for english in delta['removed']:
+            self.index.remove(english)
+        self.index.set_order(rows)
+        for english in delta['inserted'] + delta['changed']:
+            self.index.add(english, rows[english])
+        self.vocab_dict = dict(rows)
 
 
 class ConjugationAuto(ActivityAuto):
@@ -362,6 +940,19 @@ class ConjugationAuto(ActivityAuto):
         pronoun_element: Web element of the pronoun part of the question.
         verb_element: Web element of the verb part of the question.
     """
+
+    CHART_LOCATOR = (By.XPATH, "//div[@class='mb-60 no-break']")
+
+    PROMPT_SELECTORS = ("#verb-input", "#pronoun-input")
+
+    # Least verbs in a chart to parse it on a process pool. The workers are
+    # started fresh rather than forked, which costs about 0.1 s, so smaller
+    # charts parse faster serially.
+    PARALLEL_THRESHOLD = 4000
+
+    # Most processes to parse a chart with
+    MAX_PARSE_WORKERS = 8
+
     def __init__(self, driver):
         ActivityAuto.__init__(self, driver)
         self.verbs = []
@@ -384,15 +975,32 @@ class ConjugationAuto(ActivityAuto):
         
         return elements
     
+    def get_prompt(self, **kwargs):
+        """Returns the question's verb and pronoun as "verb|pronoun"."""
+
+        return self.feedback_prompt((kwargs['verb_element'].text,
+                                     kwargs['pronoun_element'].text))
+
+    def feedback_prompt(self, texts):
+        """Returns "verb|pronoun" from the recorded verb and pronoun text."""
+
+        verb_text, pronoun_text = (" ".join(text.split()) for text in texts)
+        return f"{verb_text}|{ConjugationAuto.get_pronoun(pronoun_text)}"
+
     def get_answer(self, **kwargs):
         """Gets the correct answer based on question data."""
 
+        self.last_prompt = self.get_prompt(**kwargs)
+        verb_text, pronoun = self.last_prompt.rsplit("|", 1)
+        answer = self.corrected(self.last_prompt)
+        if answer is not None:
+            return answer
+
         verb = None
         for verb in self.verbs:
-            if verb['verb'] == kwargs['verb_element'].text:
+            if verb['verb'] == verb_text:
                 break
-        return verb[ConjugationAuto.get_pronoun(
-            kwargs['pronoun_element'].text)]
+        return verb[pronoun]
 
     def load_data(self):
         """Parses and saves the data from the verb charts
@@ -401,26 +1009,74 @@ class ConjugationAuto(ActivityAuto):
         current activity.
         """
 
-        table_elements = self.driver.find_elements_by_xpath(
-            "//div[@class='mb-60 no-break']")
-        for elem in table_elements:
-            verb = elem.find_element_by_xpath(
-                ".//span[@class='fw--bold text--up']").text.lower()
-            pronoun_elements = elem.find_elements_by_xpath(
-                ".//td[@class='text-center bg-h5']")
-            pronouns = [pronoun_element.text
-                        for pronoun_element in pronoun_elements]
-            conjugated_elements = elem.find_elements_by_xpath(
-                ".//td[@class='text-center fsty--italic']")
-            conjugated = [
-                conjugated_element.text for 
-                conjugated_element in conjugated_elements]
-
-            verb_dict = {'verb': verb}
-            for p, c in zip(pronouns, conjugated):
-                verb_dict[p] = c
-
-            self.verbs.append(verb_dict)
+        self.set_data(self.read_chart())
+
+    def read_chart(self):
+        """Parses and returns the verb dictionaries of the verb charts.
+
+        The page source is read once and split into the verb blocks. Large
+        charts are parsed in parallel on a process pool, smaller ones are
+        parsed serially since starting the pool would take longer than it
+        saves.
+        """
+
+        blocks = chart_parser.split_verb_blocks(self.driver.page_source)
+
+        workers = min(os.cpu_count() or 1, ConjugationAuto.MAX_PARSE_WORKERS)
+        if len(blocks) < ConjugationAuto.PARALLEL_THRESHOLD or workers < 2:
+            return chart_parser.parse_verb_blocks(blocks)
+
+        # Parses the blocks in a few chunks per worker, in chart order
+        chunk_size = -(-len(blocks) // (4 * workers))
+        chunks = [blocks[i:i + chunk_size]
+                  for i in range(0, len(blocks), chunk_size)]
+        # Forking while the GUI, monitor and prefetch threads run could copy
+        # a lock one of them holds into a worker, which would then deadlock
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            'forkserver' if 'forkserver' in methods else 'spawn')
+
+        verbs = []
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=context) as pool:
+            for chunk_verbs in pool.map(chart_parser.parse_verb_blocks,
+                                        chunks):
+                verbs.extend(chunk_verbs)
+        return verbs
+
+    def set_data(self, data):
+        """Saves a list of verb dictionaries {pronoun : conjugation}."""
+
+        self.verbs = list(data)
+        self.fingerprints = None
+
+    def chart_rows(self, data):
+        """Returns the verb dictionaries keyed by verb, in chart order.
+
+        A verb that is in the chart more than once is keyed "verb#2", etc.
+        """
+
+        rows = {}
+        for verb_dict in data:
+            key = verb_dict['verb']
+            repeat = 1
+            while key in rows:
+                repeat += 1
+                key = f"{verb_dict['verb']}#{repeat}"
+            rows[key] = verb_dict
+        return rows
+
+    def apply_delta(self, rows, delta):
+        """Updates the verb list with changed rows.
+
+        Unchanged verbs keep their saved dictionaries, inserted and changed
+        verbs use the reloaded ones, all in the reloaded chart's order.
+        """
+
+        saved = self.chart_rows(self.verbs)
+        changed = set(delta['inserted'] + delta['changed'])
+        self.verbs = [row if key in changed else saved[key]
+                      for key, row in rows.items()]
 
     @staticmethod
     def get_pronoun(noun):
@@ -0,0 +1,365 @@
+"""Benchmarks how the answer lookup structures scale with the chart size.
+
+Synthetic vocab and verb charts from 10 to 100,000 entries are loaded through
+the same load_data parsers the automation uses, with a fake driver standing in
+for the browser. For every size the build time, peak memory of the build and
+the latency of VocabularyAuto.get_answer (with exact, normalized and
+misspelled prompts), ConjugationAuto.get_answer and
+ConjugationAuto.get_pronoun are measured.
+
+Tracing the memory of a build takes minutes above 10,000 entries, so from
+10,000 entries up the peak resident memory a build adds is also measured, in
+a new process for every build.
+
+Verb charts are always parsed serially, since whether ConjugationAuto parses
+a large chart on a process pool depends on the machine's CPU count, which
+would make the results of different machines incomparable.
+
+The results are compared to a baseline file. How each measurement scales is
+summed up by its log-log slope across the sizes (0 is constant, 1 is linear),
+and a slope that grew by more than the tolerance is flagged as a regression:
+
+    python benchmark.py                    # compare to the baseline
+    python benchmark.py --update-baseline  # save the results as the baseline
+
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the resident memory isn't measured
+    resource = None
+
+import automator
+
+SIZES = (10, 100, 1000, 10000, 100000)
+BASELINE_PATH = "benchmark_baseline.json"
+
+# Most a scaling slope may grow over the baseline before it is a regression
+SLOPE_TOLERANCE = 0.3
+
+# Amount of lookups timed for each measurement
+LOOKUPS = 200
+
+# Largest chart whose build memory is traced, tracing larger ones takes
+# minutes
+MAX_TRACED_SIZE = 10000
+
+# Smallest chart whose build's resident memory is measured, smaller builds
+# add too few pages to measure
+MIN_RSS_SIZE = 10000
+
+# Bytes in a unit of ru_maxrss, which macOS reports in bytes and Linux in KiB
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+PRONOUNS = ('yo', 'tú', 'él', 'nosotros', 'vosotros', 'ellos')
+NOUNS = ('yo', 'Tú', 'Ella', 'Usted', 'Juan y yo', 'María y Pedro',
+         'el perro', 'Ustedes')
+# Nouns whose pronoun has a column in the synthetic verb charts
+CHART_NOUNS = ('yo', 'Tú', 'Juan y yo', 'María y Pedro', 'el perro',
+               'Vosotros')
+
+
+class FakeElement:
+    """Stands in for a web element, or a driver, with text and children.
+
+    Args:
+        text: The element's text.
+    Kwargs:
+        children: Child elements by xpath {xpath : [elements]}.
+        page_source: The HTML of the page, when standing in for a driver.
+    """
+
+    def __init__(self, text="", children=None, page_source=""):
+        self.text = text
+        self.children = children or {}
+        self.page_source = page_source
+
+    def find_element_by_xpath(self, xpath):
+        return self.children[xpath][0]
+
+    def find_elements_by_xpath(self, xpath):
+        return self.children.get(xpath, [])
+
+
+def word(i):
+    """Returns a unique made up word for index i."""
+
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    i += 26
+    while i:
+        i, r = divmod(i, 26)
+        text += letters[r]
+    return text
+
+
+def vocab_driver(size):
+    """Returns a fake driver on a vocab chart with size words."""
+
+    cells = []
+    for i in range(size):
+        cells.append(FakeElement(f"{i + 1}. the {word(i)}"))
+        cells.append(FakeElement(f"{i + 1}. el {word(i)}o/la {word(i)}a"))
+    table = FakeElement(children={".//td": cells})
+    return FakeElement(children={
+        "//table[@class='table table--fat']": [table]})
+
+
+def verb_driver(size):
+    """Returns a fake driver on a verb chart with size verbs."""
+
+    blocks = "".join(
+        f'<div class="mb-60 no-break"><div><span class="fw--bold text--up">'
+        f'{word(i)}ar</span></div><table><tbody>'
+        + "".join(f'<tr><td class="text-center bg-h5">{p}</td>'
+                  f'<td class="text-center fsty--italic">{word(i)}{p}</td>'
+                  f'</tr>' for p in PRONOUNS)
+        + '</tbody></table></div>' for i in range(size))
+    return FakeElement(
+        page_source=f"<html><body><main>{blocks}</main></body></html>")
+
+
+def measure_build(activity_class, driver, size):
+    """Measures loading a chart into a new activity automator.
+
+    The chart is loaded twice, since tracing the memory slows loading down
+    too much to time it at the same time.
+
+    Returns:
+        tuple: (seconds, peak bytes or `None` if the chart is too large to
+        trace, the loaded activity automator).
+    """
+
+    activity_auto = activity_class(driver)
+    start = time.perf_counter()
+    activity_auto.load_data()
+    seconds = time.perf_counter() - start
+
+    if size > MAX_TRACED_SIZE:
+        return seconds, None, activity_auto
+
+    tracemalloc.start()
+    activity_class(driver).load_data()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return seconds, peak, activity_auto
+
+
+def peak_rss():
+    """Returns the peak resident memory of the process in bytes."""
+
+    # On Linux ru_maxrss starts at the spawning parent's peak, since it is
+    # kept across exec, while VmHWM only covers the process's own memory
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+
+def build_rss(class_name, size):
+    """Returns the bytes of resident memory loading a chart added.
+
+    Runs in a new process, so the peak isn't hidden by an earlier one.
+    """
+
+    automator.ConjugationAuto.PARALLEL_THRESHOLD = math.inf
+    if class_name == 'VocabularyAuto':
+        driver = vocab_driver(size)
+    else:
+        driver = verb_driver(size)
+
+    before = peak_rss()
+    getattr(automator, class_name)(driver).load_data()
+    return peak_rss() - before
+
+
+def measure_rss(activity_class, size):
+    """Measures the resident memory of a build in a new process.
+
+    Returns:
+        The bytes, or `None` if the size is too small or the platform
+        can't measure it.
+    """
+
+    if resource is None or size < MIN_RSS_SIZE:
+        return None
+
+    with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(build_rss, activity_class.__name__, size).result()
+
+
+def measure_lookups(lookup, arguments):
+    """Returns the mean seconds per call of lookup over arguments."""
+
+    start = time.perf_counter()
+    for kwargs in arguments:
+        lookup(**kwargs)
+    return (time.perf_counter() - start) / len(arguments)
+
+
+def run(sizes, seed=0):
+    """Runs every benchmark at every size.
+
+    Returns:
+        dict: {benchmark name : {size : value}} with sizes as strings, so it
+        can be saved as JSON.
+    """
+
+    rng = random.Random(seed)
+    results = {}
+
+    parallel_threshold = automator.ConjugationAuto.PARALLEL_THRESHOLD
+    automator.ConjugationAuto.PARALLEL_THRESHOLD = math.inf
+    try:
+        for size in sizes:
+            run_size(size, rng, results)
+    finally:
+        automator.ConjugationAuto.PARALLEL_THRESHOLD = parallel_threshold
+
+    return results
+
+
+def run_size(size, rng, results):
+    """Runs every benchmark at one size, adding to results."""
+
+    def record(name, size, value):
+        if value is not None:
+            results.setdefault(name, {})[str(size)] = value
+
+    indexes = [rng.randrange(size) for _ in range(LOOKUPS)]
+
+    seconds, peak, vocab = measure_build(
+        automator.VocabularyAuto, vocab_driver(size), size)
+    record("vocab_build_seconds", size, seconds)
+    record("vocab_build_peak_bytes", size, peak)
+    record("vocab_build_peak_rss_bytes", size,
+           measure_rss(automator.VocabularyAuto, size))
+    record("vocab_lookup_seconds", size, measure_lookups(
+        vocab.get_answer,
+        [{'question_element': FakeElement(f"the {word(i)}")}
+         for i in indexes]))
+    record("vocab_normalized_lookup_seconds", size, measure_lookups(
+        vocab.get_answer,
+        [{'question_element': FakeElement(f"{word(i).upper()}!")}
+         for i in indexes]))
+    # Misspelled prompts that only the trigram search can answer
+    record("vocab_fuzzy_lookup_seconds", size, measure_lookups(
+        vocab.get_answer,
+        [{'question_element': FakeElement(f"the {word(i)}1")}
+         for i in indexes]))
+
+    seconds, peak, conjugation = measure_build(
+        automator.ConjugationAuto, verb_driver(size), size)
+    record("verb_build_seconds", size, seconds)
+    record("verb_build_peak_bytes", size, peak)
+    record("verb_build_peak_rss_bytes", size,
+           measure_rss(automator.ConjugationAuto, size))
+    record("verb_lookup_seconds", size, measure_lookups(
+        conjugation.get_answer,
+        [{'verb_element': FakeElement(f"{word(i)}ar"),
+          'pronoun_element': FakeElement(rng.choice(CHART_NOUNS))}
+         for i in indexes]))
+
+    record("pronoun_lookup_seconds", size, measure_lookups(
+        automator.ConjugationAuto.get_pronoun,
+        [{'noun': rng.choice(NOUNS)} for _ in range(LOOKUPS)]))
+
+    print(f"Benchmarked {size} entries", file=sys.stderr)
+
+
+def slope(values):
+    """Returns the log-log slope of {size : value} from smallest to largest.
+
+    The slope is how the value scales with the size, 1 being linear.
+    """
+
+    points = sorted((int(size), value) for size, value in values.items()
+                    if value > 0)
+    if len(points) < 2:
+        return 0.0
+    (x0, y0), (x1, y1) = points[0], points[-1]
+    return math.log(y1 / y0) / math.log(x1 / x0)
+
+
+def compare(results, baseline, tolerance=SLOPE_TOLERANCE):
+    """Compares the scaling slopes of results to the baseline's.
+
+    Returns:
+        list: (name, baseline slope, slope) of every regressed benchmark.
+    """
+
+    regressions = []
+    for name, values in results.items():
+        if name not in baseline:
+            continue
+        shared = {s: v for s, v in values.items() if s in baseline[name]}
+        old = slope({s: baseline[name][s] for s in shared})
+        new = slope(shared)
+        if new > old + tolerance:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs='+', default=SIZES)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action='store_true',
+                        help="save the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes)
+
+    print(f"{'benchmark':34}" + "".join(f"{s:>12}" for s in args.sizes)
+          + f"{'slope':>8}")
+    for name, values in results.items():
+        print(f"{name:34}"
+              + "".join(f"{values[str(s)]:>12.3g}" if str(s) in values
+                        else f"{'-':>12}" for s in args.sizes)
+              + f"{slope(values):>8.2f}")
+    if max(args.sizes) > MAX_TRACED_SIZE:
+        print(f"*_peak_bytes is traced up to {MAX_TRACED_SIZE} entries only, "
+              f"since tracing larger builds takes minutes. "
+              f"*_peak_rss_bytes covers {MIN_RSS_SIZE} entries and up.")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, run with --update-baseline",
+              file=sys.stderr)
+        return 0
+
+    regressions = compare(results, baseline)
+    for name, old, new in regressions:
+        print(f"REGRESSION {name}: scales with slope {new:.2f}, "
+              f"baseline {old:.2f}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""Starts, reuses and quits the Automator's browser.
+
+A BrowserSession owns the webdriver for the lifetime of the application and
+makes sure the browser and geckodriver are quit when it exits. In persistent
+mode, geckodriver is started as its own process and the session is recorded
+in a state file instead. The next launch attaches to the still running,
+already warm browser rather than starting a new one, as long as it asks for
+the same headless and preferences settings:
+
+    session = BrowserSession(persistent=True)
+    driver = session.start()  # attaches if the recorded session is alive
+    session.close()  # leaves the browser running for the next launch
+
+"""
+
+import atexit
+import json
+import os
+import signal
+import socket
+import subprocess
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
+import browser_profile
+
+STATE_PATH = os.path.join("res", "browser_session.json")
+
+# Longest time in seconds to wait for a new geckodriver to accept connections
+DRIVER_START_TIMEOUT = 10
+
+
+def driver_path():
+    """Returns the path of the geckodriver for the current platform."""
+
+    name = "geckodriver.exe" if os.name == 'nt' else "geckodriver"
+    return os.path.join(os.getcwd(), "res", name)
+
+
+class _AttachedDriver(webdriver.Remote):
+    """A remote webdriver that uses an existing session instead of a new one.
+
+    Args:
+        executor_url: The url of the geckodriver running the session.
+        session_id: The id of the session to attach to.
+    """
+
+    def __init__(self, executor_url, session_id):
+        self._attach_session_id = session_id
+        webdriver.Remote.__init__(self, command_executor=executor_url,
+                                  desired_capabilities={})
+
+    def start_session(self, capabilities, browser_profile=None):
+        self.session_id = self._attach_session_id
+        self.capabilities = {}
+        self.w3c = True
+
+
+class BrowserSession:
+    """Manages the lifecycle of the browser used by the Automator.
+
+    Kwargs:
+        headless: Runs the browser without a window.
+        preferences: Firefox preferences {name : value} for the browser,
+            defaults to the lean preferences.
+        persistent: Keeps the browser running after the application exits
+            and reuses it on the next launch.
+        state_path: File the persistent session is recorded in.
+
+    Attributes:
+        driver: The webdriver, `None` until started.
+        attached: `True` if the driver attached to an existing session.
+    """
+
+    def __init__(self, headless=False, preferences=None, persistent=False,
+                 state_path=STATE_PATH):
+        if preferences is None:
+            preferences = browser_profile.lean_preferences()
+
+        self.headless = headless
+        self.preferences = preferences
+        self.persistent = persistent
+        self.state_path = state_path
+
+        self.driver = None
+        self.attached = False
+        self._driver_pid = None
+
+    def start(self):
+        """Starts the browser, or attaches to the recorded one.
+
+        Returns:
+            The webdriver.
+        """
+
+        if self.persistent:
+            self.driver = self._attach()
+            self.attached = self.driver is not None
+            if self.driver is None:
+                self.driver = self._start_detached()
+        else:
+            self.driver = webdriver.Firefox(
+                executable_path=driver_path(),
+                options=self._firefox_options(),
+                desired_capabilities=self._capabilities(),
+                service_log_path=os.path.devnull)
+
+        atexit.register(self.close)
+        return self.driver
+
+    def close(self):
+        """Quits the browser, unless the session is persistent."""
+
+        if self.driver is None:
+            return
+        if self.persistent:
+            self.driver = None
+        else:
+            self.quit()
+
+    def quit(self):
+        """Quits the browser and geckodriver, and forgets the session."""
+
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+        if self.persistent:
+            self._stop_driver_process()
+            if os.path.exists(self.state_path):
+                os.remove(self.state_path)
+
+    def quit_recorded(self):
+        """Quits the browser a persistent session left running.
+
+        Returns:
+            `True` if there was a running browser to quit.
+        """
+
+        self.persistent = True
+        self.driver = self._attach(match_settings=False)
+        if self.driver is None:
+            return False
+        self.quit()
+        return True
+
+    def pids(self):
+        """Returns the process ids of geckodriver and Firefox, if known."""
+
+        pids = []
+        if self._driver_pid is not None:
+            pids.append(self._driver_pid)
+        else:
+            service = getattr(self.driver, 'service', None)
+            if service is not None and service.process is not None:
+                pids.append(service.process.pid)
+
+        if self.driver is not None:
+            firefox_pid = self.driver.capabilities.get('moz:processID')
+            if firefox_pid:
+                pids.append(firefox_pid)
+
+        return pids
+
+    def _firefox_options(self):
+        firefox_options = webdriver.FirefoxOptions()
+        firefox_options.headless = self.headless
+        browser_profile.apply_preferences(firefox_options, self.preferences)
+        return firefox_options
+
+    def _capabilities(self):
+        # Navigation returns once the DOM is ready, every step then waits
+        # for just the elements it needs instead of the full page load
+        capabilities = DesiredCapabilities.FIREFOX.copy()
+        capabilities['pageLoadStrategy'] = 'eager'
+        return capabilities
+
+    def _settings(self):
+        # The settings a recorded session must have been started with, in
+        # the form they are read back from the state file
+        return json.loads(json.dumps({'headless': self.headless,
+                                      'preferences': self.preferences}))
+
+    def _attach(self, match_settings=True):
+        """Attaches to the recorded session if it is still alive.
+
+        A session that was started with other settings, for example headless
+        by the command line, is quit so a new browser can take its place.
+
+        Kwargs:
+            match_settings: Only attaches if the session was started with
+                this session's headless and preferences settings.
+
+        Returns:
+            The webdriver, or `None` if there is no usable session.
+        """
+
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            driver = _AttachedDriver(state['executor_url'],
+                                     state['session_id'])
+            driver.current_url  # Fails if the browser is gone
+        except WebDriverException:
+            # geckodriver answered but lost the browser, so it is stopped
+            self._driver_pid = state.get('driver_pid')
+            self._stop_driver_process()
+            os.remove(self.state_path)
+            return None
+        except Exception:
+            # geckodriver is gone, its recorded pid may belong to another
+            # process by now
+            os.remove(self.state_path)
+            return None
+
+        self._driver_pid = state.get('driver_pid')
+        if match_settings and state.get('settings') != self._settings():
+            self.driver = driver
+            self.quit()
+            return None
+        return driver
+
+    def _start_detached(self):
+        """Starts geckodriver in its own process and opens a session on it.
+
+        The session is recorded in the state file so later launches can
+        attach to it.
+        """
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs['creationflags'] = (subprocess.DETACHED_PROCESS
+                                       | subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            kwargs['start_new_session'] = True
+        process = subprocess.Popen(
+            [driver_path(), "--port", str(port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+        self._driver_pid = process.pid
+
+        start = time.monotonic()
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), 0.1).close()
+                break
+            except OSError:
+                if time.monotonic() - start > DRIVER_START_TIMEOUT:
+                    self._stop_driver_process()
+                    raise
+                time.sleep(0.05)
+
+        executor_url = f"http://127.0.0.1:{port}"
+        driver = webdriver.Remote(command_executor=executor_url,
+                                  desired_capabilities=self._capabilities(),
+                                  options=self._firefox_options())
+
+        with open(self.state_path, 'w') as f:
+            json.dump({'executor_url': executor_url,
+                       'session_id': driver.session_id,
+                       'driver_pid': self._driver_pid,
+                       'settings': self._settings()}, f)
+
+        return driver
+
+    def _stop_driver_process(self):
+        if self._driver_pid is None:
+            return
+        try:
+            os.kill(self._driver_pid, signal.SIGTERM)
+        except OSError:
+            pass
+        self._driver_pid = None
@@ -0,0 +1,109 @@
+"""Finds the rows that changed between two loads of an activity's chart.
+
+Every chart row is fingerprinted, so a reload only has to compare
+fingerprints to know which rows were inserted, removed or changed, and only
+those rows have to be applied to the activity's indexes:
+
+>>> old = fingerprints({'the dog': 'el perro', 'the cat': 'el gato'})
+>>> new = fingerprints({'the dog': 'el perro', 'the cow': 'la vaca'})
+>>> diff(old, new)
+{'inserted': ['the cow'], 'removed': ['the cat'], 'changed': []}
+
+The ChartStore keeps the last loaded rows of every activity on disk, and
+patches them with each reload's delta.
+"""
+
+import hashlib
+import json
+
+STORE_PATH = "res/charts.json"
+
+
+def fingerprint(row):
+    """Returns a short, stable hash of a chart row."""
+
+    if isinstance(row, str):
+        data = row
+    else:
+        data = json.dumps(row, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+
+def fingerprints(rows):
+    """Returns the fingerprint of every row {row key : fingerprint}."""
+
+    return {key: fingerprint(row) for key, row in rows.items()}
+
+
+def diff(old, new):
+    """Compares the fingerprints of two loads of a chart.
+
+    Args:
+        old: The fingerprints {row key : fingerprint} of the previous load.
+        new: The fingerprints of the current load.
+
+    Returns:
+        dict: The row keys that were 'inserted', 'removed' and 'changed'.
+    """
+
+    return {'inserted': [key for key in new if key not in old],
+            'removed': [key for key in old if key not in new],
+            'changed': [key for key, fp in new.items()
+                        if key in old and old[key] != fp]}
+
+
+def is_empty(delta):
+    """Returns `True` if a delta has no inserted, removed or changed rows."""
+
+    return not (delta['inserted'] or delta['removed'] or delta['changed'])
+
+
+class ChartStore:
+    """Saves the last loaded chart rows of every activity.
+
+    Kwargs:
+        path: The JSON file the charts are saved in.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+
+        try:
+            with open(self.path, 'r') as f:
+                self._charts = json.load(f)
+        except (OSError, ValueError):
+            self._charts = {}
+
+    def rows(self, activity):
+        """Returns the stored rows {row key : row} of an activity, or `None`."""
+
+        return self._charts.get(activity)
+
+    def patch(self, activity, rows, delta):
+        """Applies a reload's delta to the stored rows of an activity.
+
+        Args:
+            activity: The name of the activity.
+            rows: All rows {row key : row} of the reloaded chart.
+            delta: The changed row keys, as from diff.
+
+        Returns:
+            `True` if the stored rows changed and need to be saved.
+        """
+
+        stored = self._charts.get(activity)
+        if stored is None:
+            self._charts[activity] = dict(rows)
+            return True
+
+        for key in delta['removed']:
+            stored.pop(key, None)
+        for key in delta['inserted'] + delta['changed']:
+            stored[key] = rows[key]
+        return not is_empty(delta)
+
+    def save(self):
+        """Saves the stored charts to the store's file."""
+
+        with open(self.path, 'w') as f:
+            json.dump(self._charts, f, ensure_ascii=False)
@@ -0,0 +1,173 @@
+"""Parses conjuguemos vocabulary and verb charts.
+
+The charts can be read either through the webdriver's elements or from the raw
+HTML of the chart page. Both ways build the same data with the helpers in this
+module:
+
+    vocab_dict = parse_vocab_chart(html)  # {english : spanish}
+    verbs = parse_verb_chart(html)  # [{'verb': ..., pronoun : conjugation}]
+
+Text read from the HTML is whitespace-normalized the same way the webdriver
+normalizes an element's text.
+"""
+
+import re
+from html.parser import HTMLParser
+
+VOCAB_TABLE_CLASS = "table table--fat"
+VERB_BLOCK_CLASS = "mb-60 no-break"
+VERB_NAME_CLASS = "fw--bold text--up"
+PRONOUN_CLASS = "text-center bg-h5"
+CONJUGATED_CLASS = "text-center fsty--italic"
+
+# Start tag of a verb chart block, where the page source is split into blocks
+_VERB_BLOCK_START = re.compile(
+    r'<div\b[^>]*\bclass\s*=\s*["\']' + re.escape(VERB_BLOCK_CLASS)
+    + r'["\'][^>]*>')
+
+# Elements that never have an end tag
+_VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                  'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+
+def vocab_from_cells(cell_texts):
+    """Builds the vocab dictionary from the chart's cell texts.
+
+    Args:
+        cell_texts: The text of every chart cell in order, alternating
+            between english and spanish. Each cell starts with a number,
+            like "1. hello".
+
+    Returns:
+        dict: The vocab words {english : spanish}.
+    """
+
+    words = [text[text.find(".") + 1:].strip() for text in cell_texts]
+    return dict(zip(words[0::2], words[1::2]))
+
+
+def verb_from_parts(verb, pronouns, conjugated):
+    """Builds a verb dictionary {pronoun : conjugation} from a chart block."""
+
+    verb_dict = {'verb': verb.lower()}
+    for p, c in zip(pronouns, conjugated):
+        verb_dict[p] = c
+    return verb_dict
+
+
+def _normalize(text):
+    return " ".join(text.split())
+
+
+class _ChartParser(HTMLParser):
+    """Collects the text of chart elements from a chart page's HTML.
+
+    Attributes:
+        vocab_cells: Text of every cell in the vocab chart table.
+        verb_blocks: (verb, pronouns, conjugated) for every verb chart block.
+    """
+
+    def __init__(self):
+        HTMLParser.__init__(self, convert_charrefs=True)
+        self.vocab_cells = []
+        self.verb_blocks = []
+
+        # Stack of (tag, role) for every open element
+        self._stack = []
+        self._text = None
+
+    def _inside(self, role):
+        return any(r == role for _, r in self._stack)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_ELEMENTS:
+            return
+
+        css_class = dict(attrs).get('class') or ""
+        role = None
+        if tag == 'table' and css_class == VOCAB_TABLE_CLASS:
+            role = 'vocab_table'
+        elif tag == 'div' and css_class == VERB_BLOCK_CLASS:
+            role = 'verb_block'
+            self.verb_blocks.append(["", [], []])
+        elif self._inside('vocab_table') and tag == 'td':
+            role = 'vocab_cell'
+        elif self._inside('verb_block'):
+            if tag == 'span' and css_class == VERB_NAME_CLASS:
+                role = 'verb_name'
+            elif tag == 'td' and css_class == PRONOUN_CLASS:
+                role = 'pronoun'
+            elif tag == 'td' and css_class == CONJUGATED_CLASS:
+                role = 'conjugated'
+
+        if role in ('vocab_cell', 'verb_name', 'pronoun', 'conjugated'):
+            self._text = []
+        self._stack.append((tag, role))
+
+    def handle_endtag(self, tag):
+        # Closes unclosed elements up to the matching start tag
+        if not any(t == tag for t, _ in self._stack):
+            return
+        while self._stack:
+            t, role = self._stack.pop()
+            self._finish(role)
+            if t == tag:
+                break
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+    def _finish(self, role):
+        if role not in ('vocab_cell', 'verb_name', 'pronoun', 'conjugated'):
+            return
+
+        text = _normalize("".join(self._text))
+        self._text = None
+        if role == 'vocab_cell':
+            self.vocab_cells.append(text)
+        elif role == 'verb_name':
+            self.verb_blocks[-1][0] = text
+        elif role == 'pronoun':
+            self.verb_blocks[-1][1].append(text)
+        else:
+            self.verb_blocks[-1][2].append(text)
+
+
+def parse_vocab_chart(html):
+    """Returns the vocab dictionary {english : spanish} of a vocab chart."""
+
+    parser = _ChartParser()
+    parser.feed(html)
+    parser.close()
+    return vocab_from_cells(parser.vocab_cells)
+
+
+def parse_verb_chart(html):
+    """Returns the list of verb dictionaries of a verb chart."""
+
+    parser = _ChartParser()
+    parser.feed(html)
+    parser.close()
+    return [verb_from_parts(*block) for block in parser.verb_blocks]
+
+
+def split_verb_blocks(html):
+    """Splits a verb chart's HTML into the HTML of each verb block.
+
+    Each block runs from its start tag to the start of the next block, so
+    the pieces can be parsed independently and in any order.
+    """
+
+    starts = [m.start() for m in _VERB_BLOCK_START.finditer(html)]
+    return [html[start:end]
+            for start, end in zip(starts, starts[1:] + [len(html)])]
+
+
+def parse_verb_blocks(blocks):
+    """Returns the verb dictionaries of a list of verb block HTML pieces.
+
+    This is a module level function so it can run in a process pool.
+    """
+
+    return parse_verb_chart("".join(blocks))
@@ -0,0 +1,257 @@
+"""Runs Auto-Conjuguemos from the terminal without the GUI.
+
+This module drives the Automator directly and never imports tkinter, so it
+starts faster than the GUI application and can run on machines without a
+display by using a headless browser. The activity and its options are taken
+from command line arguments, a JSON config file, or both, with the arguments
+taking precedence:
+
+    python . "Preterite -ar verbs" --username me --speed 0.5 --headless
+
+A config file holds the same keys as the long argument names:
+
+    {"activity": "Preterite -ar verbs", "username": "me", "password": "...",
+     "time_limit": 10, "word_amount": 100, "target_percent": 100,
+     "speed": 0.5, "auto_submit": true, "headless": true,
+     "full_browser": false, "keep_browser": false, "prefetch_workers": 4}
+
+A browser kept running with --keep-browser is quit with:
+
+    python . --quit-browser
+
+"""
+
+import argparse
+import getpass
+import json
+import sys
+
+import automator
+import browser_session
+
+DEFAULTS = {'time_limit': 10,
+            'word_amount': 100,
+            'target_percent': 100,
+            'speed': 0.01,
+            'auto_submit': False,
+            'headless': False,
+            'full_browser': False,
+            'keep_browser': False,
+            'prefetch_workers': 4,
+            'quit_browser': False}
+
+
+def parse_args(argv=None):
+    """Parses the command line arguments.
+
+    Only arguments that were given are included in the result, so they can
+    be layered on top of the config file.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="auto-conjuguemos",
+        description="Automatically completes a conjuguemos activity.",
+        argument_default=argparse.SUPPRESS)
+    parser.add_argument("activity", nargs='?',
+                        help="name of the assigned activity to complete")
+    parser.add_argument("-c", "--config",
+                        help="JSON file with the activity and options")
+    parser.add_argument("-u", "--username")
+    parser.add_argument("-p", "--password",
+                        help="prompted for if not given")
+    parser.add_argument("--time-limit", dest='time_limit', type=int,
+                        help="timer in minutes (1-45)")
+    parser.add_argument("--word-amount", dest='word_amount', type=int,
+                        help="amount of words to answer (0-499)")
+    parser.add_argument("--target-percent", dest='target_percent', type=int,
+                        help="percent of answers to get right (0-100)")
+    parser.add_argument("--speed", type=float,
+                        help="seconds per word")
+    parser.add_argument("--auto-submit", dest='auto_submit',
+                        action='store_true',
+                        help="record the score when the timer runs out")
+    parser.add_argument("--headless", action='store_true',
+                        help="run the browser without a window")
+    parser.add_argument("--full-browser", dest='full_browser',
+                        action='store_true',
+                        help="load images, fonts and third-party requests")
+    parser.add_argument("--keep-browser", dest='keep_browser',
+                        action='store_true',
+                        help="keep the browser running for the next launch")
+    parser.add_argument("--prefetch-workers", dest='prefetch_workers',
+                        type=int,
+                        help="most activity charts to prefetch at the same "
+                             "time, 0 disables prefetching")
+    parser.add_argument("--quit-browser", dest='quit_browser',
+                        action='store_true',
+                        help="quit the browser kept by --keep-browser and exit")
+
+    return vars(parser.parse_args(argv))
+
+
+def load_settings(argv=None):
+    """Combines the defaults, config file and command line arguments."""
+
+    args = parse_args(argv)
+
+    settings = dict(DEFAULTS)
+    if 'config' in args:
+        with open(args.pop('config'), 'r') as f:
+            settings.update(json.load(f))
+    settings.update(args)
+
+    # Uses the same limits as the GUI's OptionsScene
+    settings['time_limit'] = min(45, max(1, int(settings['time_limit'])))
+    settings['word_amount'] = min(499, max(0, int(settings['word_amount'])))
+    settings['target_percent'] = min(
+        100, max(0, int(settings['target_percent'])))
+    settings['speed'] = max(0.01, float(settings['speed']))
+    settings['prefetch_workers'] = max(0, int(settings['prefetch_workers']))
+
+    return settings
+
+
+def find_activity(activity_list, name):
+    """Finds an activity by name.
+
+    An exact (case-insensitive) match is preferred, otherwise the activity
+    name only has to contain name.
+
+    Returns:
+        The activity dictionary, or `None` if no single activity matches.
+    """
+
+    name = name.strip().lower()
+    exact = [a for a in activity_list if a['name'].strip().lower() == name]
+    if exact:
+        return exact[0]
+
+    partial = [a for a in activity_list if name in a['name'].lower()]
+    if len(partial) == 1:
+        return partial[0]
+    return None
+
+
+def print_progress(current_secs, current_mins,
+                   current_words, correct_words, current_percent):
+    """Prints the current automation data over the previous progress line.
+
+    Has the same signature as AutomationScene.update so it can be passed to
+    run_automation.
+    """
+
+    print(f"\rTime Left: {current_mins}:{current_secs:02d}  "
+          f"Words: {correct_words}/{current_words}  "
+          f"Percent: {current_percent}%", end='', flush=True)
+
+
+def main(argv=None):
+    """Runs one activity from the terminal.
+
+    Returns:
+        The process exit code.
+    """
+
+    settings = load_settings(argv)
+
+    if settings['quit_browser']:
+        if browser_session.BrowserSession().quit_recorded():
+            print("Quit the kept browser.")
+        else:
+            print("No kept browser is running.")
+        return 0
+
+    if not settings.get('activity'):
+        print("No activity given.", file=sys.stderr)
+        return 2
+    if not settings.get('username'):
+        settings['username'] = input("Username: ")
+    if not settings.get('password'):
+        settings['password'] = getpass.getpass("Password: ")
+
+    print("Starting browser...")
+    auto = automator.Automator(
+        headless=settings['headless'],
+        preferences={} if settings['full_browser'] else None,
+        prefetch_workers=settings['prefetch_workers'],
+        persistent=settings['keep_browser'])
+
+    try:
+        return run(auto, settings)
+    finally:
+        auto.close()
+
+
+def run(auto, settings):
+    """Logs in, then loads, starts and automates the activity.
+
+    Returns:
+        The process exit code.
+    """
+
+    print("Logging in...")
+    result = auto.login(settings['username'], settings['password'])
+    if result == 0:
+        print("Username or password not accepted.", file=sys.stderr)
+        return 1
+    if result == -1:
+        print("Login attempt timed out.", file=sys.stderr)
+        return 1
+
+    activity_list = auto.get_activities()
+    activity = find_activity(activity_list, settings['activity'])
+    if activity is None:
+        print(f"No single activity matches '{settings['activity']}'. "
+              "Assigned activities:", file=sys.stderr)
+        for i, a in enumerate(activity_list):
+            print(f"{i + 1}. {a['name']}", file=sys.stderr)
+        return 1
+
+    print(f"Loading {activity['name']}...")
+    # Downloads the chart while the browser opens the activity
+    auto.start_prefetch([activity])
+    activity['click']()
+    auto.get_data(activity['name'], activity['url'])
+
+    auto.activity_auto.set_options(
+        time_limit=settings['time_limit'],
+        word_amount=settings['word_amount'],
+        target_percent=settings['target_percent'],
+        speed=settings['speed'],
+        auto_submit=settings['auto_submit'])
+
+    auto.prepare_start()
+
+    completed = auto.activity_auto.run_automation(print_progress)
+    auto.finish_run(completed)
+    print()
+    if not completed:
+        print("There was an error with the automation.", file=sys.stderr)
+        return 1
+
+    report = auto.activity_auto.pacing_report
+    if report['achieved_speed'] is not None:
+        print(f"Seconds per word: {report['achieved_speed']:.2f} s achieved, "
+              f"{report['configured_speed']} s configured")
+
+    index = getattr(auto.activity_auto, 'index', None)
+    if index is not None:
+        print(f"Answers not matching the chart exactly: "
+              f"{100 * index.fallback_rate():.0f}% {index.stats}")
+    resources = auto.resource_report
+    if resources is not None:
+        print(f"Browser peak: {resources['peak_rss'] / 2**20:.0f} MB in "
+              f"{resources['peak_processes']} processes, "
+              f"{resources['peak_threads']} threads, "
+              f"{resources['cpu_time']:.1f} s CPU time")
+    if not settings['auto_submit']:
+        print("The score was not submitted automatically.")
+        if not settings['headless']:
+            input("Submit the score in the browser, then press Enter to "
+                  "close it.")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
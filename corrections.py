@@ -0,0 +1,116 @@
+"""Remembers the answers conjuguemos corrected, per activity.
+
+When the activity marks an answer wrong and shows the expected answer, the
+correction is stored so later questions, and later runs, answer the prompt the
+way the activity expects instead of the way the chart reads. Each activity's
+table is bounded and evicts its least recently used corrections first:
+
+>>> table = CorrectionTable(max_entries=2)
+>>> table.add("hablar|yo", "hablé")
+>>> table.add("hablar|tú", "hablaste")
+>>> table.add("hablar|él", "habló")
+>>> table.get("hablar|yo") is None
+True
+>>> table.get("hablar|él")
+'habló'
+
+A CorrectionStore loads the tables of every activity from a JSON file and
+saves them back to it.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+STORE_PATH = "res/corrections.json"
+
+# Most corrections kept for a single activity
+MAX_ENTRIES = 500
+
+
+class CorrectionTable:
+    """The corrections of one activity, with least recently used eviction.
+
+    Args:
+        entries: Corrections {prompt : answer}, least recently used first.
+    Kwargs:
+        max_entries: Most corrections to keep.
+    """
+
+    def __init__(self, entries=(), max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict(entries)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, prompt):
+        """Returns the corrected answer of a prompt, or `None`."""
+
+        with self._lock:
+            answer = self._entries.get(prompt)
+            if answer is not None:
+                self._entries.move_to_end(prompt)
+            return answer
+
+    def add(self, prompt, answer):
+        """Stores a correction, evicting the least recently used if full."""
+
+        with self._lock:
+            self._entries[prompt] = answer
+            self._entries.move_to_end(prompt)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remove(self, prompt):
+        """Forgets the correction of a prompt."""
+
+        with self._lock:
+            self._entries.pop(prompt, None)
+
+    def items(self):
+        """Returns the corrections, least recently used first."""
+
+        with self._lock:
+            return list(self._entries.items())
+
+
+class CorrectionStore:
+    """Loads and saves the correction tables of every activity.
+
+    Kwargs:
+        path: The JSON file the tables are saved in.
+        max_entries: Most corrections to keep for each activity.
+    """
+
+    def __init__(self, path=STORE_PATH, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._tables = {}
+
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+
+        for activity, entries in saved.items():
+            self._tables[activity] = CorrectionTable(
+                entries, max_entries=max_entries)
+
+    def table(self, activity):
+        """Returns the correction table of an activity, creating it if new."""
+
+        if activity not in self._tables:
+            self._tables[activity] = CorrectionTable(
+                max_entries=self.max_entries)
+        return self._tables[activity]
+
+    def save(self):
+        """Saves every non-empty table to the store's file."""
+
+        saved = {activity: table.items()
+                 for activity, table in self._tables.items() if len(table)}
+        with open(self.path, 'w') as f:
+            json.dump(saved, f, ensure_ascii=False, indent=1)
@@ -0,0 +1,292 @@
+"""Looks up vocab answers even when the prompt doesn't match the chart exactly.
+
+The AnswerIndex is built once from a vocab dictionary {english : spanish} and
+answers prompts in either direction. A lookup tries, in order:
+
+1. The exact prompt, which is a single dictionary lookup.
+2. The normalized prompt, ignoring case, accents, punctuation, extra
+   whitespace and leading articles.
+3. The closest normalized key by trigram similarity, which tolerates typos.
+
+>>> index = AnswerIndex({'the dog': 'el perro'})
+>>> index.lookup('Dog!')
+'el perro'
+>>> index.lookup('el pero')
+'the dog'
+
+"""
+
+import string
+import unicodedata
+
+# Leading articles that the chart and the live prompt don't always agree on
+ARTICLES = {'the', 'a', 'an', 'el', 'la', 'los', 'las', 'un', 'una', 'unos',
+            'unas'}
+
+_PUNCTUATION = str.maketrans("", "", string.punctuation + "¿¡«»“”‘’…")
+
+
+def normalize(text):
+    """Returns text without case, accents, punctuation or a leading article."""
+
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    words = text.translate(_PUNCTUATION).split()
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    return " ".join(words)
+
+
+def trigrams(text):
+    """Returns the set of character trigrams of text, padded at the ends."""
+
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AnswerIndex:
+    """Finds the answer to a vocab prompt in either direction.
+
+    Args:
+        vocab_dict: Dictionary of vocab words {english : spanish}.
+    Kwargs:
+        min_similarity: Lowest trigram similarity (0 to 1) a fuzzy match
+            needs to be accepted.
+
+    Attributes:
+        stats: Amount of lookups answered by each method
+            {'exact', 'normalized', 'fuzzy', 'miss'}.
+    """
+
+    def __init__(self, vocab_dict, min_similarity=0.5):
+        self.min_similarity = min_similarity
+        self.stats = {'exact': 0, 'normalized': 0, 'fuzzy': 0, 'miss': 0}
+
+        self._vocab = {}
+
+        # Chart position of every row {english : position}, which breaks
+        # ties between rows that give a prompt different answers
+        self._order = {}
+        self._next_position = 0
+
+        # Answers by prompt, and every chart row that gives the prompt an
+        # answer {prompt : {(priority, english) : answer}}
+        self._exact = {}
+        self._exact_owners = {}
+        self._normalized = {}
+        self._normalized_owners = {}
+
+        # Trigrams of the normalized keys, removed keys leave a `None`
+        self._key_ids = {}
+        self._keys = []
+        self._key_trigrams = []
+        self._trigram_keys = {}
+
+        # Fuzzy results by prompt, since prompts repeat during an activity
+        self._fuzzy_cache = {}
+
+        for english, spanish in vocab_dict.items():
+            self.add(english, spanish)
+
+    @staticmethod
+    def _prompts(english, spanish):
+        """Returns (prompt, answer, priority) for both directions of a row.
+
+        english -> spanish prompts have priority, so they win collisions.
+        """
+
+        return ((english, spanish, 0), (spanish, english, 1))
+
+    @staticmethod
+    def _normalized_keys(prompt):
+        """Returns the normalized keys of a prompt and its alternatives."""
+
+        # Slash separated alternatives can each be the prompt
+        keys = {normalize(prompt)}
+        keys.update(normalize(a) for a in prompt.split("/"))
+        keys.discard("")
+        return keys
+
+    def _resolve(self, owners):
+        """Returns the answer of the best priority row earliest in the chart."""
+
+        (priority, english), answer = min(
+            owners.items(),
+            key=lambda item: (item[0][0], self._order[item[0][1]]))
+        return answer
+
+    def add(self, english, spanish):
+        """Adds a chart row, replacing the row's previous spanish if any.
+
+        A new row goes after the others in the chart order, unless set_order
+        gave it a position.
+        """
+
+        position = self._order.get(english)
+        if english in self._vocab:
+            self.remove(english)
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+        self._order[english] = position
+        self._vocab[english] = spanish
+
+        for prompt, answer, priority in AnswerIndex._prompts(english, spanish):
+            owner = (priority, english)
+            owners = self._exact_owners.setdefault(prompt, {})
+            owners[owner] = answer
+            self._exact[prompt] = self._resolve(owners)
+
+            for key in AnswerIndex._normalized_keys(prompt):
+                owners = self._normalized_owners.setdefault(key, {})
+                owners[owner] = answer
+                self._normalized[key] = self._resolve(owners)
+                if key not in self._key_ids:
+                    self._add_key(key)
+
+        self._fuzzy_cache.clear()
+
+    def remove(self, english):
+        """Removes the chart row of an english word."""
+
+        spanish = self._vocab.pop(english, None)
+        if spanish is None:
+            return
+
+        for prompt, _, priority in AnswerIndex._prompts(english, spanish):
+            owner = (priority, english)
+            self._disown(self._exact, self._exact_owners, prompt, owner)
+            for key in AnswerIndex._normalized_keys(prompt):
+                if self._disown(self._normalized, self._normalized_owners,
+                                key, owner):
+                    self._remove_key(key)
+
+        del self._order[english]
+        self._fuzzy_cache.clear()
+
+    def set_order(self, englishes):
+        """Sets the chart order of the rows, after the chart was reloaded.
+
+        Rows that aren't added yet get their position for when they are.
+        Prompts that more than one row answers are resolved again, so the
+        index answers them the same as one built from the reloaded chart.
+
+        Args:
+            englishes: The english word of every row, in chart order.
+        """
+
+        order = {english: i for i, english in enumerate(englishes)}
+        # Rows that are about to be removed keep a position after the others
+        for english in self._vocab:
+            if english not in order:
+                order[english] = len(order)
+        self._order = order
+        self._next_position = len(order)
+
+        for answers, owners_by_prompt in (
+                (self._exact, self._exact_owners),
+                (self._normalized, self._normalized_owners)):
+            for prompt, owners in owners_by_prompt.items():
+                if len(owners) > 1:
+                    answers[prompt] = self._resolve(owners)
+        self._fuzzy_cache.clear()
+
+    def _disown(self, answers, owners_by_prompt, prompt, owner):
+        """Removes a row's claim on a prompt.
+
+        Returns:
+            `True` if no row gives the prompt an answer anymore.
+        """
+
+        owners = owners_by_prompt.get(prompt)
+        if owners is None or owner not in owners:
+            return False
+        del owners[owner]
+        if owners:
+            answers[prompt] = self._resolve(owners)
+            return False
+        del owners_by_prompt[prompt]
+        del answers[prompt]
+        return True
+
+    def _add_key(self, key):
+        key_id = len(self._keys)
+        self._key_ids[key] = key_id
+        self._keys.append(key)
+        self._key_trigrams.append(trigrams(key))
+        for t in self._key_trigrams[key_id]:
+            self._trigram_keys.setdefault(t, set()).add(key_id)
+
+    def _remove_key(self, key):
+        key_id = self._key_ids.pop(key)
+        for t in self._key_trigrams[key_id]:
+            self._trigram_keys[t].discard(key_id)
+        self._keys[key_id] = None
+        self._key_trigrams[key_id] = None
+
+    def lookup(self, prompt):
+        """Returns the answer to a prompt.
+
+        Raises:
+            KeyError: If no chart entry is close enough to the prompt.
+        """
+
+        answer = self._exact.get(prompt)
+        if answer is not None:
+            self.stats['exact'] += 1
+            return answer
+
+        key = normalize(prompt)
+        answer = self._normalized.get(key)
+        if answer is not None:
+            self.stats['normalized'] += 1
+            return answer
+
+        if prompt not in self._fuzzy_cache:
+            self._fuzzy_cache[prompt] = self.closest(key)
+        answer = self._fuzzy_cache[prompt]
+        if answer is not None:
+            self.stats['fuzzy'] += 1
+            return answer
+
+        self.stats['miss'] += 1
+        raise KeyError(prompt)
+
+    def closest(self, key):
+        """Returns the answer of the normalized key most similar to key.
+
+        Similarity is the Dice coefficient of the keys' trigrams. Only keys
+        that share at least one trigram with key are compared, and equally
+        similar keys are decided by their text, so the result doesn't depend
+        on the order the keys were added in.
+
+        Returns:
+            The answer, or `None` if no key reaches min_similarity.
+        """
+
+        key_trigrams = trigrams(key)
+        shared = {}
+        for t in key_trigrams:
+            for i in self._trigram_keys.get(t, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        best, best_score = None, 0.0
+        for i, count in shared.items():
+            score = (2 * count
+                     / (len(key_trigrams) + len(self._key_trigrams[i])))
+            if score > best_score or (
+                    score == best_score and self._keys[i] < self._keys[best]):
+                best, best_score = i, score
+
+        if best is None or best_score < self.min_similarity:
+            return None
+        return self._normalized[self._keys[best]]
+
+    def fallback_rate(self):
+        """Returns the fraction of answered lookups that weren't exact."""
+
+        answered = (self.stats['exact'] + self.stats['normalized']
+                    + self.stats['fuzzy'])
+        if answered == 0:
+            return 0.0
+        return (self.stats['normalized'] + self.stats['fuzzy']) / answered
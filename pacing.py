@@ -0,0 +1,110 @@
+"""Paces the answers of an automated conjuguemos activity.
+
+The Pacer schedules each answer against a monotonic deadline rather than
+measuring the time since the last answer finished. The time a webdriver call
+takes is therefore absorbed into the wait before the next answer instead of
+being added on top of it, so the achieved rate stays at the configured one.
+
+The clock and sleep functions can be swapped out, which lets the tests drive
+the pacing with a fake clock.
+"""
+
+import time
+
+
+class Pacer:
+    """Schedules actions at a fixed interval using monotonic deadlines.
+
+    Args:
+        interval: Seconds between the starts of two consecutive actions.
+    Kwargs:
+        clock: Function that returns the current monotonic time in seconds.
+        sleep: Function that blocks for the given amount of seconds.
+
+    Attributes:
+        start_time: Clock time when the pacer was started.
+        next_deadline: Clock time when the next action is due.
+        actions: Amount of actions marked as done.
+    """
+
+    def __init__(self, interval, clock=time.monotonic, sleep=time.sleep):
+        self.interval = max(0.0, float(interval))
+        self.clock = clock
+        self.sleep = sleep
+
+        self.start_time = None
+        self.next_deadline = None
+        self.actions = 0
+        self._first_action_time = None
+        self._last_action_time = None
+
+    def start(self):
+        """Starts the pacer, the first action is due immediately."""
+
+        self.start_time = self.clock()
+        self.next_deadline = self.start_time
+        self.actions = 0
+        self._first_action_time = None
+        self._last_action_time = None
+
+    def elapsed(self):
+        """Returns the seconds elapsed since the pacer was started."""
+
+        return self.clock() - self.start_time
+
+    def due(self):
+        """Returns `True` if the next action's deadline has been reached."""
+
+        return self.clock() >= self.next_deadline
+
+    def remaining(self):
+        """Returns the seconds until the next deadline, negative if late."""
+
+        return self.next_deadline - self.clock()
+
+    def mark_done(self):
+        """Records an action and schedules the next deadline.
+
+        The next deadline is based on the previous deadline, not on when the
+        action finished, so a slow action shortens the following wait. If the
+        pacer falls more than one interval behind, it does not try to catch up
+        with a burst of actions, the next action is due one interval after
+        the late one.
+        """
+
+        now = self.clock()
+
+        if self._first_action_time is None:
+            self._first_action_time = now
+        self._last_action_time = now
+        self.actions += 1
+
+        self.next_deadline += self.interval
+        if self.next_deadline < now - self.interval:
+            self.next_deadline = now + self.interval
+
+    def wait(self, max_wait):
+        """Sleeps until the next deadline, but no longer than max_wait."""
+
+        remaining = self.remaining()
+        if remaining > 0:
+            self.sleep(min(remaining, max_wait))
+
+    def achieved_interval(self):
+        """Returns the average seconds between actions.
+
+        Returns:
+            The achieved interval, or `None` with fewer than two actions.
+        """
+
+        if self.actions < 2:
+            return None
+        return ((self._last_action_time - self._first_action_time)
+                / (self.actions - 1))
+
+    def report(self):
+        """Returns the configured and achieved pacing of the run."""
+
+        return {'configured_speed': self.interval,
+                'achieved_speed': self.achieved_interval(),
+                'actions': self.actions}
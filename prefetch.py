@@ -0,0 +1,166 @@
+"""Prefetches the vocab/verb charts of activities in the background.
+
+While the user is choosing an activity, a ChartPrefetcher downloads and parses
+the chart of every listed activity on a small pool of worker threads. The
+charts are fetched over HTTP with the cookies of the logged-in webdriver
+session, so the browser's tab is never touched:
+
+    prefetcher = ChartPrefetcher(driver.get_cookies(), driver.current_url)
+    prefetcher.prefetch(activity_urls)
+    chart = prefetcher.get(activity_urls[0])  # {'vocabulary', 'data'}
+
+"""
+
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import chart_parser
+
+
+def chart_url(activity_url):
+    """Returns the chart url of an activity and whether it is vocabulary.
+
+    Returns:
+        tuple: (chart url, `True` if it is a vocabulary activity).
+    """
+
+    if "vocabulary" in activity_url:
+        insertion_pos = activity_url.find("vocabulary") + len("vocabulary")
+        return (activity_url[:insertion_pos] + "/vocab_chart"
+                + activity_url[insertion_pos:], True)
+
+    insertion_pos = activity_url.find("verb") + len("verb")
+    return (activity_url[:insertion_pos] + "/verb_chart"
+            + activity_url[insertion_pos:], False)
+
+
+def prefetchable(activity_url, origin_url):
+    """Returns `True` if an activity's chart may be fetched with the cookies.
+
+    The session cookies are only sent over https to the host of the
+    logged-in page, and only for links that chart_url turns into a vocab or
+    verb chart url.
+
+    Args:
+        activity_url: The url of the activity.
+        origin_url: A url of the logged-in site, like driver.current_url.
+    """
+
+    activity = urllib.parse.urlsplit(activity_url or "")
+    origin = urllib.parse.urlsplit(origin_url or "")
+    if activity.scheme != 'https' or origin.scheme != 'https':
+        return False
+    if not activity.hostname or activity.hostname != origin.hostname:
+        return False
+    if activity.port != origin.port:
+        return False
+
+    path = urllib.parse.urlsplit(chart_url(activity_url)[0]).path
+    return "/vocabulary/vocab_chart/" in path or "/verb/verb_chart/" in path
+
+
+class ChartPrefetcher:
+    """Downloads and parses activity charts on a bounded thread pool.
+
+    Args:
+        cookies: The webdriver session cookies, as from driver.get_cookies().
+        origin_url: A url of the logged-in site, like driver.current_url.
+            Only activities on its host are prefetched.
+    Kwargs:
+        user_agent: The User-Agent header to send with the requests.
+        max_workers: Most charts to download at the same time.
+        timeout: Seconds before a chart download is abandoned.
+    """
+
+    def __init__(self, cookies, origin_url, user_agent=None, max_workers=4,
+                 timeout=10):
+        self.headers = {'Cookie': "; ".join(
+            f"{c['name']}={c['value']}" for c in cookies)}
+        if user_agent:
+            self.headers['User-Agent'] = user_agent
+        self.origin_url = origin_url
+        self.timeout = timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, activity_urls):
+        """Queues the charts of the activities that aren't already queued.
+
+        Activities that aren't prefetchable, like links to other sites, are
+        skipped.
+        """
+
+        with self._lock:
+            for url in activity_urls:
+                if (prefetchable(url, self.origin_url)
+                        and url not in self._futures):
+                    self._futures[url] = self._executor.submit(
+                        self.fetch, url)
+
+    def fetch(self, activity_url):
+        """Downloads and parses the chart of an activity.
+
+        Returns:
+            dict: {'vocabulary': bool, 'data': parsed chart}, where the data
+            is a vocab dictionary for vocabulary activities and a list of
+            verb dictionaries otherwise.
+
+        Raises:
+            ValueError: If the chart page has no chart, for example because
+                the session has expired.
+        """
+
+        url, vocabulary = chart_url(activity_url)
+        request = urllib.request.Request(url, headers=self.headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+            html = response.read().decode(charset, errors='replace')
+
+        if vocabulary:
+            data = chart_parser.parse_vocab_chart(html)
+        else:
+            data = chart_parser.parse_verb_chart(html)
+        if not data:
+            raise ValueError(f"No chart found at {url}")
+
+        return {'vocabulary': vocabulary, 'data': data}
+
+    def get(self, activity_url, timeout=None):
+        """Returns the prefetched chart of an activity.
+
+        A chart is only returned once, so an activity that is loaded again
+        gets a fresh chart after prefetching it again. A chart whose download
+        hasn't started yet is cancelled instead of waited for, since loading
+        it in the browser is faster than waiting for the other downloads.
+
+        Args:
+            activity_url: The url of the activity, as it was prefetched.
+            timeout: Seconds to wait for a chart that is still downloading.
+
+        Returns:
+            The result of fetch, or `None` if the chart wasn't prefetched,
+            hasn't started downloading or couldn't be downloaded.
+        """
+
+        with self._lock:
+            future = self._futures.pop(activity_url, None)
+        if future is None or future.cancel():
+            return None
+
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+
+    def shutdown(self):
+        """Cancels the queued downloads and stops the worker threads."""
+
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures = {}
+        self._executor.shutdown(wait=False)
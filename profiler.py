@@ -0,0 +1,146 @@
+"""Opt-in sampling profiler for the automation's worker threads.
+
+When the AUTO_CONJUGUEMOS_PROFILE environment variable is set to a directory,
+the functions decorated with profiled are sampled while they run. A sampler
+thread reads the profiled thread's stack at a fixed interval instead of
+instrumenting every call, and writes the counted stacks in collapsed-stack
+format, ready for flame graph tools:
+
+    AUTO_CONJUGUEMOS_PROFILE=profiles python .
+    flamegraph.pl profiles/run_automation-*.folded > run_automation.svg
+
+AUTO_CONJUGUEMOS_PROFILE_INTERVAL sets the seconds between samples. The time
+the sampler spends collecting stacks is reported with each profile, which is
+how much the profiled thread was slowed down.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV = "AUTO_CONJUGUEMOS_PROFILE"
+INTERVAL_ENV = "AUTO_CONJUGUEMOS_PROFILE_INTERVAL"
+DEFAULT_INTERVAL = 0.005
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread from a background thread.
+
+    Args:
+        thread_id: The ident of the thread to sample.
+    Kwargs:
+        interval: Seconds between samples.
+
+    Attributes:
+        stacks: Amount of samples of each stack {collapsed stack : count}.
+        samples: Amount of samples taken.
+        sampling_time: Seconds spent collecting samples.
+        wall_time: Seconds the profiler ran for.
+    """
+
+    def __init__(self, thread_id, interval=DEFAULT_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+
+        self.stacks = {}
+        self.samples = 0
+        self.sampling_time = 0.0
+        self.wall_time = 0.0
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_time = None
+
+    def start(self):
+        """Starts sampling in a daemon thread."""
+
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops sampling and waits for the sampler thread to finish."""
+
+        self._stop.set()
+        self._thread.join()
+        self.wall_time = time.perf_counter() - self._start_time
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            sample_start = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = SamplingProfiler.collapse(frame)
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+                self.samples += 1
+            self.sampling_time += time.perf_counter() - sample_start
+
+    @staticmethod
+    def collapse(frame):
+        """Returns a frame's stack as "outer;...;inner" function names."""
+
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} "
+                         f"({os.path.basename(code.co_filename)}:"
+                         f"{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def overhead(self):
+        """Returns the fraction of the run spent collecting samples."""
+
+        if self.wall_time == 0:
+            return 0.0
+        return self.sampling_time / self.wall_time
+
+    def write(self, path):
+        """Writes the sampled stacks in collapsed-stack format."""
+
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def profiled(name):
+    """Decorates a function to be profiled when profiling is turned on.
+
+    Each call is sampled and written to "<name>-<time>.folded" in the
+    AUTO_CONJUGUEMOS_PROFILE directory. Without the environment variable the
+    function is called directly.
+
+    Args:
+        name: The name the profiles are saved under.
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            directory = os.environ.get(PROFILE_ENV)
+            if not directory:
+                return func(*args, **kwargs)
+
+            interval = float(os.environ.get(INTERVAL_ENV, DEFAULT_INTERVAL))
+            profiler = SamplingProfiler(threading.get_ident(), interval)
+            profiler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.stop()
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(
+                    directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}"
+                               f"-{profiler.thread_id}.folded")
+                profiler.write(path)
+                sys.stderr.write(
+                    f"{name}: {profiler.samples} samples in "
+                    f"{profiler.wall_time:.2f} s, sampling overhead "
+                    f"{100 * profiler.overhead():.2f}%, saved to {path}\n")
+
+        return wrapper
+
+    return decorator
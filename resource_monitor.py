@@ -0,0 +1,173 @@
+"""Monitors the memory, CPU time and threads of the browser processes.
+
+The Firefox and geckodriver processes the Automator starts use far more
+resources than the Python process does. A ResourceMonitor samples a set of
+processes and all their descendants from /proc in a background thread and
+keeps the peaks:
+
+    monitor = ResourceMonitor([geckodriver_pid, firefox_pid])
+    monitor.start()
+    ...
+    monitor.stop()
+    monitor.report()  # {'peak_rss', 'peak_threads', 'peak_processes', ...}
+
+Only Linux has /proc, elsewhere the monitor does nothing and reports `None`.
+"""
+
+import os
+import threading
+
+PROC = "/proc"
+
+# Seconds between samples
+DEFAULT_INTERVAL = 0.5
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_CLOCK_TICKS = (os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf')
+                else 100)
+
+
+def available():
+    """Returns `True` if processes can be sampled on this platform."""
+
+    return os.path.isdir(os.path.join(PROC, "self"))
+
+
+def read_stat(pid):
+    """Reads a process's parent, CPU time, thread count and resident memory.
+
+    Returns:
+        dict: {'ppid', 'cpu_time' (seconds), 'threads', 'rss' (bytes)}, or
+        `None` if the process is gone.
+    """
+
+    try:
+        with open(os.path.join(PROC, str(pid), "stat"), 'r') as f:
+            stat = f.read()
+    except OSError:
+        return None
+
+    # The command name may contain spaces, so fields are counted after it
+    fields = stat[stat.rfind(")") + 2:].split()
+    return {'ppid': int(fields[1]),
+            'cpu_time': (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS,
+            'threads': int(fields[17]),
+            'rss': int(fields[21]) * _PAGE_SIZE}
+
+
+def process_tree(root_pids):
+    """Returns the stats of the root processes and all their descendants.
+
+    Returns:
+        dict: {pid : stat} as from read_stat.
+    """
+
+    stats = {}
+    for entry in os.listdir(PROC):
+        if entry.isdigit():
+            stat = read_stat(int(entry))
+            if stat is not None:
+                stats[int(entry)] = stat
+
+    children = {}
+    for pid, stat in stats.items():
+        children.setdefault(stat['ppid'], []).append(pid)
+
+    tree = {}
+    pending = [pid for pid in root_pids if pid in stats]
+    while pending:
+        pid = pending.pop()
+        if pid not in tree:
+            tree[pid] = stats[pid]
+            pending.extend(children.get(pid, ()))
+    return tree
+
+
+class ResourceMonitor:
+    """Samples a process tree in a background thread and keeps the peaks.
+
+    Args:
+        root_pids: The processes to monitor along with their descendants.
+    Kwargs:
+        interval: Seconds between samples.
+
+    Attributes:
+        peaks: The highest totals sampled {'rss', 'threads', 'processes'}.
+        samples: Amount of samples taken.
+    """
+
+    def __init__(self, root_pids, interval=DEFAULT_INTERVAL):
+        self.root_pids = [pid for pid in root_pids if pid]
+        self.interval = interval
+
+        self.peaks = {'rss': 0, 'threads': 0, 'processes': 0}
+        self.samples = 0
+
+        self._cpu_start = {}
+        self._cpu_last = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Takes the first sample and keeps sampling in a daemon thread."""
+
+        if not available() or not self.root_pids:
+            return
+
+        tree = self.sample()
+        self._cpu_start = {pid: s['cpu_time'] for pid, s in tree.items()}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops sampling after taking a last sample."""
+
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.sample()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Samples the process tree once and updates the peaks.
+
+        Returns:
+            dict: {pid : stat} of the sampled processes.
+        """
+
+        tree = process_tree(self.root_pids)
+        self.peaks['rss'] = max(
+            self.peaks['rss'], sum(s['rss'] for s in tree.values()))
+        self.peaks['threads'] = max(
+            self.peaks['threads'], sum(s['threads'] for s in tree.values()))
+        self.peaks['processes'] = max(self.peaks['processes'], len(tree))
+        for pid, s in tree.items():
+            self._cpu_last[pid] = s['cpu_time']
+        self.samples += 1
+        return tree
+
+    def cpu_time(self):
+        """Returns the CPU seconds the processes used while monitored."""
+
+        return sum(cpu - self._cpu_start.get(pid, 0.0)
+                   for pid, cpu in self._cpu_last.items())
+
+    def report(self):
+        """Returns the peaks and CPU time, or `None` if nothing was sampled.
+
+        Returns:
+            dict: {'peak_rss' (bytes), 'peak_threads', 'peak_processes',
+            'cpu_time' (seconds)}.
+        """
+
+        if self.samples == 0:
+            return None
+        return {'peak_rss': self.peaks['rss'],
+                'peak_threads': self.peaks['threads'],
+                'peak_processes': self.peaks['processes'],
+                'cpu_time': self.cpu_time()}
@@ -0,0 +1,239 @@
+"""Keeps a local history of every automation run and reports trends.
+
+Each finished run appends a summary and the latency of every answer to a
+SQLite database. Rows are only ever inserted, so older runs stay comparable
+with newer ones and regressions can be spotted over time. Automator.finish_run
+records each run, and RunHistory.report returns the latest runs along with
+their answer latency percentiles.
+
+The report can also be printed from the terminal:
+
+    python run_history.py                         # the last runs of all
+    python run_history.py "Preterite -ar verbs"   # one activity's runs
+
+Runs that didn't complete are marked with "!" in the printed report.
+"""
+
+import argparse
+import math
+import sqlite3
+import sys
+import time
+
+HISTORY_PATH = "res/history.sqlite3"
+
+# Runs shown by the report by default
+REPORT_RUNS = 20
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        activity TEXT NOT NULL,
+        started_at REAL NOT NULL,
+        completed INTEGER NOT NULL,
+        configured_speed REAL,
+        achieved_speed REAL,
+        answers INTEGER,
+        correct_answers INTEGER,
+        checked_answers INTEGER,
+        mistakes INTEGER,
+        failures INTEGER,
+        chart_source TEXT,
+        chart_load_seconds REAL,
+        start_seconds REAL,
+        automation_seconds REAL,
+        peak_rss INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS runs_activity_started
+        ON runs (activity, started_at);
+    CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+    CREATE TABLE IF NOT EXISTS answers (
+        run_id INTEGER NOT NULL REFERENCES runs (id),
+        question INTEGER NOT NULL,
+        latency REAL NOT NULL,
+        PRIMARY KEY (run_id, question)
+    );
+"""
+
+# Columns of the runs table a run summary may have
+_RUN_COLUMNS = ('activity', 'started_at', 'completed', 'configured_speed',
+                'achieved_speed', 'answers', 'correct_answers',
+                'checked_answers', 'mistakes', 'failures', 'chart_source',
+                'chart_load_seconds', 'start_seconds', 'automation_seconds',
+                'peak_rss')
+
+
+def percentile(values, percent):
+    """Returns the nearest-rank percentile of values, or `None` if empty."""
+
+    if not values:
+        return None
+    values = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+class RunHistory:
+    """Appends run summaries and answer latencies to a SQLite database.
+
+    Kwargs:
+        path: The database file, created if it doesn't exist.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def record(self, run, latencies=()):
+        """Appends a finished run.
+
+        Args:
+            run: The run summary, with an 'activity' and any of the other
+                columns of the runs table. 'started_at' defaults to now.
+            latencies: Seconds each answer took to submit, in order.
+
+        Returns:
+            int: The id of the recorded run.
+        """
+
+        run = {column: run.get(column) for column in _RUN_COLUMNS}
+        if run['started_at'] is None:
+            run['started_at'] = time.time()
+        run['completed'] = int(bool(run['completed']))
+
+        connection = self._connect()
+        try:
+            with connection:
+                run_id = connection.execute(
+                    f"INSERT INTO runs ({', '.join(_RUN_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_RUN_COLUMNS))})",
+                    [run[column] for column in _RUN_COLUMNS]).lastrowid
+                connection.executemany(
+                    "INSERT INTO answers (run_id, question, latency) "
+                    "VALUES (?, ?, ?)",
+                    [(run_id, i, latency)
+                     for i, latency in enumerate(latencies)])
+        finally:
+            connection.close()
+        return run_id
+
+    def runs(self, activity=None, since=None, limit=REPORT_RUNS):
+        """Returns the latest run summaries, oldest first.
+
+        Args:
+            activity: Only returns the runs of this activity if given.
+            since: Only returns the runs started after this time if given.
+            limit: Most runs to return.
+
+        Returns:
+            list: A dict of the runs table's columns for every run.
+        """
+
+        conditions, parameters = [], []
+        if activity is not None:
+            conditions.append("activity = ?")
+            parameters.append(activity)
+        if since is not None:
+            conditions.append("started_at >= ?")
+            parameters.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                f"SELECT * FROM runs {where} "
+                f"ORDER BY started_at DESC LIMIT ?",
+                parameters + [limit]).fetchall()
+        finally:
+            connection.close()
+        return [dict(row) for row in reversed(rows)]
+
+    def latencies(self, run_id):
+        """Returns the answer latencies of a run in order."""
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT latency FROM answers WHERE run_id = ? "
+                "ORDER BY question", (run_id,)).fetchall()
+        finally:
+            connection.close()
+        return [row['latency'] for row in rows]
+
+    def report(self, activity=None, since=None, limit=REPORT_RUNS):
+        """Returns the run summaries with their answer latency percentiles.
+
+        Takes the same arguments as runs.
+
+        Returns:
+            list: The dicts of runs, each with 'latency_p50' and
+            'latency_p95' in seconds and 'accuracy' as a fraction, which
+            are `None` if unknown.
+        """
+
+        runs = self.runs(activity=activity, since=since, limit=limit)
+        for run in runs:
+            latencies = self.latencies(run['id'])
+            run['latency_p50'] = percentile(latencies, 50)
+            run['latency_p95'] = percentile(latencies, 95)
+            run['accuracy'] = None
+            if run['checked_answers']:
+                run['accuracy'] = 1 - run['mistakes'] / run['checked_answers']
+        return runs
+
+
+def _format(value, scale=1, digits=1, suffix=""):
+    if value is None:
+        return "-"
+    return f"{value * scale:.{digits}f}{suffix}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("activity", nargs='?',
+                        help="only report the runs of this activity")
+    parser.add_argument("--days", type=float,
+                        help="only report the runs of the last days")
+    parser.add_argument("--limit", type=int, default=REPORT_RUNS,
+                        help="most runs to report")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    args = parser.parse_args(argv)
+
+    since = None
+    if args.days is not None:
+        since = time.time() - args.days * 24 * 60 * 60
+
+    runs = RunHistory(args.history).report(
+        activity=args.activity, since=since, limit=args.limit)
+    if not runs:
+        print("No runs recorded.")
+        return 0
+
+    print(f"{'started':17}{'activity':28}{'answers':>8}{'accuracy':>9}"
+          f"{'p50 ms':>8}{'p95 ms':>8}{'s/word':>8}{'chart s':>8}"
+          f"{'start s':>8}{'fails':>6}")
+    for run in runs:
+        started = time.strftime("%Y-%m-%d %H:%M",
+                                time.localtime(run['started_at']))
+        activity = run['activity'][:26]
+        if not run['completed']:
+            activity = "! " + activity[:24]
+        print(f"{started:17}{activity:28}"
+              f"{_format(run['answers'], digits=0):>8}"
+              f"{_format(run['accuracy'], 100, 0, '%'):>9}"
+              f"{_format(run['latency_p50'], 1000):>8}"
+              f"{_format(run['latency_p95'], 1000):>8}"
+              f"{_format(run['achieved_speed'], digits=2):>8}"
+              f"{_format(run['chart_load_seconds'], digits=2):>8}"
+              f"{_format(run['start_seconds'], digits=2):>8}"
+              f"{_format(run['failures'], digits=0):>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
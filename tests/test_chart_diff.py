@@ -0,0 +1,70 @@
+import automator
+import chart_diff
+
+
+def test_diff_finds_inserted_removed_and_changed_rows():
+    old = chart_diff.fingerprints({'a': '1', 'b': '2', 'c': '3'})
+    new = chart_diff.fingerprints({'a': '1', 'b': '20', 'd': '4'})
+
+    assert chart_diff.diff(old, new) == {'inserted': ['d'],
+                                         'removed': ['c'],
+                                         'changed': ['b']}
+    assert chart_diff.is_empty(chart_diff.diff(new, new))
+
+
+def test_fingerprints_ignore_verb_key_order():
+    assert (chart_diff.fingerprint({'verb': 'ser', 'yo': 'soy'})
+            == chart_diff.fingerprint({'yo': 'soy', 'verb': 'ser'}))
+
+
+def test_chart_store_patch_and_save(tmp_path):
+    path = str(tmp_path / "charts.json")
+    store = chart_diff.ChartStore(path)
+    assert store.rows('act') is None
+
+    rows = {'a': '1', 'b': '2'}
+    assert store.patch('act', rows, chart_diff.diff(
+        {}, chart_diff.fingerprints(rows)))
+    store.save()
+
+    store = chart_diff.ChartStore(path)
+    rows = {'a': '10', 'c': '3'}
+    delta = chart_diff.diff(chart_diff.fingerprints(store.rows('act')),
+                            chart_diff.fingerprints(rows))
+    assert store.patch('act', rows, delta)
+    assert not store.patch('act', rows, chart_diff.diff(
+        chart_diff.fingerprints(rows), chart_diff.fingerprints(rows)))
+    store.save()
+
+    assert chart_diff.ChartStore(path).rows('act') == rows
+
+
+def test_update_data_applies_deltas():
+    vocab = automator.VocabularyAuto(None)
+    rows, delta = vocab.update_data({'the dog': 'el perro', 'cat': 'gato'})
+    assert delta['inserted'] == ['the dog', 'cat']
+
+    rows, delta = vocab.update_data({'cow': 'vaca', 'the dog': 'el can'})
+    assert delta == {'inserted': ['cow'], 'removed': ['cat'],
+                     'changed': ['the dog']}
+    assert vocab.vocab_dict == {'cow': 'vaca', 'the dog': 'el can'}
+    assert vocab.index.lookup('the dog') == 'el can'
+
+    verbs = automator.ConjugationAuto(None)
+    verbs.update_data([{'verb': 'ser', 'yo': 'soy'},
+                       {'verb': 'ir', 'yo': 'voy'}])
+    rows, delta = verbs.update_data([{'verb': 'estar', 'yo': 'estoy'},
+                                     {'verb': 'ser', 'yo': 'fui'}])
+    assert delta == {'inserted': ['estar'], 'removed': ['ir'],
+                     'changed': ['ser']}
+    assert verbs.verbs == [{'verb': 'estar', 'yo': 'estoy'},
+                           {'verb': 'ser', 'yo': 'fui'}]
+
+
+def test_update_data_diffs_the_first_load_against_previous_rows():
+    vocab = automator.VocabularyAuto(None)
+    rows, delta = vocab.update_data(
+        {'a': '1', 'c': '30'}, previous_rows={'a': '1', 'b': '2', 'c': '3'})
+
+    assert delta == {'inserted': [], 'removed': ['b'], 'changed': ['c']}
+    assert vocab.vocab_dict == {'a': '1', 'c': '30'}
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+import lookup
+
+# A small pool of words so rows often share a spanish answer or a
+# normalized key
+ENGLISH = ["the dog", "dog", "a cat", "the cat", "cow", "the cow", "fish",
+           "bird", "the bird", "horse", "mouse", "the house", "house"]
+SPANISH = ["el perro", "perro", "el gato", "la gata", "la vaca", "vaca",
+           "el pez", "el pájaro", "pájaro", "el caballo", "el ratón",
+           "la casa", "casa/hogar"]
+
+
+def answers(index, prompts):
+    """Returns the answer of every prompt, `None` for a miss."""
+
+    result = {}
+    for prompt in prompts:
+        try:
+            result[prompt] = index.lookup(prompt)
+        except KeyError:
+            result[prompt] = None
+    return result
+
+
+def prompts_for(vocab_dicts):
+    """Returns exact, normalized and misspelled prompts for the rows."""
+
+    prompts = set(ENGLISH) | set(SPANISH)
+    for vocab_dict in vocab_dicts:
+        prompts.update(vocab_dict)
+        prompts.update(vocab_dict.values())
+    variations = set()
+    for prompt in prompts:
+        variations.add(prompt.upper() + "!")
+        variations.add(prompt[:-1])
+        variations.add(prompt + "s")
+    return sorted(prompts | variations)
+
+
+def random_chart(rng):
+    englishes = rng.sample(ENGLISH, rng.randint(0, len(ENGLISH)))
+    return {english: rng.choice(SPANISH) for english in englishes}
+
+
+def test_lookup_directions_and_fallbacks():
+    index = lookup.AnswerIndex({'the dog': 'el perro', 'the house': 'casa/hogar'})
+
+    assert index.lookup('the dog') == 'el perro'
+    assert index.lookup('el perro') == 'the dog'
+    assert index.lookup('Dog!') == 'el perro'
+    assert index.lookup('hogar') == 'the house'
+    assert index.lookup('el pero') == 'the dog'
+    with pytest.raises(KeyError):
+        index.lookup('zzzz')
+    assert index.stats == {'exact': 2, 'normalized': 2, 'fuzzy': 1,
+                           'miss': 1}
+
+
+def test_ties_go_to_the_row_earliest_in_the_chart():
+    index = lookup.AnswerIndex({'dog': 'el perro', 'the dog': 'el perro'})
+    assert index.lookup('el perro') == 'dog'
+
+    # Re-adding a row keeps its chart position
+    index.add('dog', 'el perro')
+    assert index.lookup('el perro') == 'dog'
+
+    index.set_order(['the dog', 'dog'])
+    assert index.lookup('el perro') == 'the dog'
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_incremental_updates_match_a_rebuild(seed):
+    rng = random.Random(seed)
+    old = random_chart(rng)
+    index = lookup.AnswerIndex(old)
+
+    for _ in range(5):
+        new = random_chart(rng)
+        removed = [english for english in old if english not in new]
+        changed = [english for english in new
+                   if english not in old or old[english] != new[english]]
+
+        for english in removed:
+            index.remove(english)
+        index.set_order(new)
+        for english in changed:
+            index.add(english, new[english])
+
+        prompts = prompts_for([old, new])
+        assert (answers(index, prompts)
+                == answers(lookup.AnswerIndex(new), prompts))
+        old = new
@@ -0,0 +1,98 @@
+import pytest
+
+import pacing
+
+
+class FakeClock:
+    """A monotonic clock that only moves when slept on or advanced."""
+
+    def __init__(self):
+        self.time = 100.0
+        self.sleeps = []
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.time += seconds
+
+    def advance(self, seconds):
+        self.time += seconds
+
+
+def run(pacer, clock, actions, latency, max_wait=0.05):
+    """Paces actions the way run_automation does and returns their times."""
+
+    times = []
+    pacer.start()
+    while len(times) < actions:
+        if pacer.due():
+            times.append(clock.now())
+            clock.advance(latency)
+            pacer.mark_done()
+        pacer.wait(max_wait)
+    return times
+
+
+def test_sub_50ms_interval_is_honoured():
+    clock = FakeClock()
+    pacer = pacing.Pacer(0.02, clock=clock.now, sleep=clock.sleep)
+
+    times = run(pacer, clock, actions=50, latency=0.001)
+
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert gaps == pytest.approx([0.02] * 49)
+    # Never sleeps past the next deadline
+    assert max(clock.sleeps) <= 0.02
+
+
+def test_driver_latency_is_absorbed_without_drift():
+    clock = FakeClock()
+    pacer = pacing.Pacer(0.5, clock=clock.now, sleep=clock.sleep)
+
+    times = run(pacer, clock, actions=200, latency=0.3)
+
+    start = times[0]
+    assert times == pytest.approx(
+        [start + 0.5 * i for i in range(200)])
+
+
+def test_slow_actions_do_not_burst_to_catch_up():
+    clock = FakeClock()
+    pacer = pacing.Pacer(0.1, clock=clock.now, sleep=clock.sleep)
+
+    pacer.start()
+    pacer.mark_done()
+    clock.advance(1.0)  # a stall of ten intervals
+
+    # Only the late action is due, the next one is a full interval after it
+    assert pacer.due()
+    pacer.mark_done()
+    assert not pacer.due()
+    assert pacer.remaining() == pytest.approx(0.1)
+
+
+def test_achieved_interval_and_report():
+    clock = FakeClock()
+    pacer = pacing.Pacer(0.2, clock=clock.now, sleep=clock.sleep)
+
+    pacer.start()
+    assert pacer.achieved_interval() is None
+    assert pacer.report() == {'configured_speed': 0.2,
+                              'achieved_speed': None,
+                              'actions': 0}
+
+    pacer.mark_done()
+    assert pacer.achieved_interval() is None
+
+    # Actions completing 0.25 s apart on average
+    for delay in (0.2, 0.3, 0.25):
+        clock.advance(delay)
+        pacer.mark_done()
+
+    assert pacer.achieved_interval() == pytest.approx(0.25)
+    report = pacer.report()
+    assert report['configured_speed'] == 0.2
+    assert report['achieved_speed'] == pytest.approx(0.25)
+    assert report['actions'] == 4